@@ -1,7 +1,31 @@
+import re
 from functools import lru_cache
 from pathlib import Path
 
+_PLACEHOLDER_RE = re.compile(r"__([A-Z][A-Z_]*?)__")
+
+
+class PromptTemplate:
+    """Prompt text split once around its ``__NAME__`` placeholders."""
+
+    def __init__(self, text: str) -> None:
+        parts = _PLACEHOLDER_RE.split(text)
+        self._literals = parts[0::2]
+        self._names = [name.lower() for name in parts[1::2]]
+
+    def render(self, **values: str) -> str:
+        chunks = [self._literals[0]]
+        for name, literal in zip(self._names, self._literals[1:]):
+            chunks.append(values[name])
+            chunks.append(literal)
+        return "".join(chunks)
+
 
 @lru_cache(maxsize=None)
 def load_prompt(path: str) -> str:
     return Path(path).read_text(encoding="utf-8").strip()
+
+
+@lru_cache(maxsize=None)
+def load_template(path: str) -> PromptTemplate:
+    return PromptTemplate(load_prompt(path))
@@ -1,5 +1,9 @@
 """Insight-generation agent package."""
 
-from app.agents.insights.generator import generate_widget_insight, get_groq_client
+from app.agents.insights.generator import (
+    agenerate_widget_insight,
+    generate_widget_insight,
+    get_groq_client,
+)
 
-__all__ = ["get_groq_client", "generate_widget_insight"]
+__all__ = ["get_groq_client", "generate_widget_insight", "agenerate_widget_insight"]
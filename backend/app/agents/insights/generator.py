@@ -1,12 +1,43 @@
-import json
 from pathlib import Path
 from typing import Any, Dict, List
 
-from app.agents._prompt_loader import load_prompt
+import orjson
+
+from app.agents._llm_cache import SingleFlight, cache_key
+from app.agents._prompt_loader import load_template
 from app.core.config import settings
-from app.integrations.groq_client import get_groq_client
+from app.integrations.groq_client import get_async_groq_client, get_groq_client
+
+_PROMPT_PATH = str(Path(__file__).with_name("prompts") / "widget_insight_prompt.md")
+
+_NO_DATA_MESSAGE = "Not enough data to generate insights yet."
+_UNAVAILABLE_MESSAGE = "Analysis momentarily unavailable. Please try again shortly."
+
+# Only a short snapshot is sent; the slice happens before serializing so a
+# large widget result is never encoded in full.
+INSIGHT_PREVIEW_ROWS = 10
 
-_PROMPT_PATH = Path(__file__).with_name("prompts") / "widget_insight_prompt.md"
+# Dashboard loads and refreshes can ask for the same widget insight several
+# times at once; those callers share a single completion.
+_insight_flights = SingleFlight()
+
+
+def _build_messages(
+    title: str,
+    viz_type: str,
+    data: List[Dict[str, Any]],
+    filters: Dict[str, Any],
+) -> list[dict]:
+    prompt = load_template(_PROMPT_PATH).render(
+        title=title,
+        viz_type=viz_type,
+        filters=orjson.dumps(filters, default=str).decode(),
+        data=orjson.dumps(data[:INSIGHT_PREVIEW_ROWS], default=str).decode(),
+    )
+    return [
+        {"role": "system", "content": "You provide short, professional data insights."},
+        {"role": "user", "content": prompt},
+    ]
 
 
 def generate_widget_insight(
@@ -16,26 +47,43 @@ def generate_widget_insight(
     filters: Dict[str, Any],
 ) -> str:
     if not data:
-        return "Not enough data to generate insights yet."
-
-    prompt = (
-        load_prompt(str(_PROMPT_PATH))
-        .replace("__TITLE__", title)
-        .replace("__VIZ_TYPE__", viz_type)
-        .replace("__FILTERS__", json.dumps(filters))
-        .replace("__DATA__", json.dumps(data[:10], indent=2))
-    )
+        return _NO_DATA_MESSAGE
 
+    messages = _build_messages(title, viz_type, data, filters)
     try:
         completion = get_groq_client().chat.completions.create(
-            messages=[
-                {"role": "system", "content": "You provide short, professional data insights."},
-                {"role": "user", "content": prompt},
-            ],
-            model=settings.groq_model,
+            messages=messages,
+            model=settings.groq_model_fast,
             temperature=0.3,
             max_tokens=150,
         )
         return completion.choices[0].message.content.strip()
     except Exception:
-        return "Analysis momentarily unavailable. Please try again shortly."
+        return _UNAVAILABLE_MESSAGE
+
+
+async def _complete_insight(messages: list[dict]) -> str:
+    completion = await get_async_groq_client().chat.completions.create(
+        messages=messages,
+        model=settings.groq_model_fast,
+        temperature=0.3,
+        max_tokens=150,
+    )
+    return completion.choices[0].message.content.strip()
+
+
+async def agenerate_widget_insight(
+    title: str,
+    viz_type: str,
+    data: List[Dict[str, Any]],
+    filters: Dict[str, Any],
+) -> str:
+    """Async variant that keeps the event loop free while Groq responds."""
+    if not data:
+        return _NO_DATA_MESSAGE
+
+    messages = _build_messages(title, viz_type, data, filters)
+    try:
+        return await _insight_flights.run(cache_key(messages), lambda: _complete_insight(messages))
+    except Exception:
+        return _UNAVAILABLE_MESSAGE
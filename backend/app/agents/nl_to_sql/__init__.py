@@ -1,8 +1,14 @@
 """Natural-language-to-SQL agent package."""
 
-from app.agents.nl_to_sql.generator import generate_error_correction, generate_sql
-from app.agents.nl_to_sql.graph import ChatState, build_chat_graph, chat_graph, run_chat
-from app.agents.nl_to_sql.llm import get_llm
+from app.agents.nl_to_sql.generator import generate_error_correction, generate_sql, remember_sql
+from app.agents.nl_to_sql.graph import (
+    ChatState,
+    build_chat_graph,
+    chat_graph,
+    run_chat,
+    stream_chat,
+)
+from app.agents.nl_to_sql.llm import get_json_llm, get_llm, get_structured_llm
 from app.agents.nl_to_sql.prompts import build_conversation_prompt, build_system_prompt
 
 __all__ = [
@@ -10,9 +16,13 @@ __all__ = [
     "build_chat_graph",
     "chat_graph",
     "run_chat",
+    "stream_chat",
     "get_llm",
+    "get_json_llm",
+    "get_structured_llm",
     "generate_sql",
     "generate_error_correction",
+    "remember_sql",
     "build_system_prompt",
     "build_conversation_prompt",
 ]
@@ -1,12 +1,89 @@
-import json
 import re
 
+import orjson
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 
+from app.agents._llm_cache import SQLiteTTLCache, TTLCache, cache_key, question_key
 from app.agents.nl_to_sql.llm import get_llm
+from app.core.config import settings
+
+SQL_CACHE_MAX_ENTRIES = 1024
+SQL_CACHE_TTL_SECONDS = 600
+# Persisted answers only depend on the schema, which is part of the key.
+PERSISTENT_SQL_CACHE_TTL_SECONDS = 7 * 24 * 3600
+# Part of every question-tier key; bump it whenever question_key changes so
+# entries persisted under an older normalization are never served.
+QUESTION_KEY_VERSION = 3
+
+# A word right after the opening fence is a language tag only when a newline
+# follows it (or it is sql/json followed by a space); otherwise, as in
+# ```SELECT id FROM t```, it is the start of the body.
+_FENCE_RE = re.compile(r"```(?:(\w*)[ \t]*\n|(sql|json)[ \t]+)?(.*?)```", re.DOTALL | re.IGNORECASE)
+# The explanation ends where the METADATA label or the first fence starts.
+_EXPLANATION_RE = re.compile(r"EXPLANATION:\s*(.+?)(?=METADATA:|```|$)", re.DOTALL | re.IGNORECASE)
+_EXPLANATION_LABEL_RE = re.compile(r"^EXPLANATION:\s*", re.IGNORECASE)
+_METADATA_LABEL_RE = re.compile(r"\s*METADATA:\s*$", re.IGNORECASE)
+_METADATA_FENCED_RE = re.compile(r"METADATA:\s*```json\s*(.*?)\s*```", re.DOTALL | re.IGNORECASE)
+_METADATA_INLINE_RE = re.compile(r"METADATA:.*?({.*?})", re.DOTALL | re.IGNORECASE)
+
+# Generation runs at temperature 0 and the system prompt embeds the schema, so
+# an identical message list (same schema, history, and question) yields the
+# same answer and can skip the Groq round trip. Both tiers are filled by
+# remember_sql only after the SQL has run successfully.
+_sql_cache = TTLCache(SQL_CACHE_MAX_ENTRIES, SQL_CACHE_TTL_SECONDS)
+
+# Second tier for opening questions: the same system prompt (and so the same
+# schema) plus the same normalized question, so rephrasings that differ only
+# in case, punctuation, or plurals share one answer. With
+# SQL_CACHE_PATH set it lives in SQLite so common questions stay warm across
+# restarts and deploys.
+_question_cache: TTLCache | SQLiteTTLCache = (
+    SQLiteTTLCache(settings.sql_cache_path, SQL_CACHE_MAX_ENTRIES, PERSISTENT_SQL_CACHE_TTL_SECONDS)
+    if settings.sql_cache_path
+    else TTLCache(SQL_CACHE_MAX_ENTRIES, SQL_CACHE_TTL_SECONDS)
+)
+
+
+def _question_cache_key(messages: list[dict]) -> str | None:
+    system, *turns = messages
+    # Only opening questions: no assistant turns and one distinct user
+    # message (history already contains the message being asked).
+    if system["role"] != "system" or not turns:
+        return None
+    if any(msg["role"] != "user" for msg in turns) or len({msg["content"] for msg in turns}) != 1:
+        return None
+    normalized = question_key(turns[-1]["content"])
+    if not normalized:
+        return None
+    return cache_key(QUESTION_KEY_VERSION, system["content"], normalized)
+
+
+def remember_sql(messages: list[dict], explanation: str, metadata: dict, sql: str) -> None:
+    """Cache ``sql`` as the answer to ``messages``.
+
+    Called only once the SQL has validated and run, so a query the database
+    rejected is never served again from either tier.
+    """
+    entry = (explanation, dict(metadata), sql)
+    _sql_cache.set(cache_key(messages), entry)
+    question_cache_key = _question_cache_key(messages)
+    if question_cache_key is not None:
+        _question_cache.set(question_cache_key, entry)
 
 
 def generate_sql(messages: list[dict]) -> tuple[str, dict, str]:
+    key = cache_key(messages)
+    cached = _sql_cache.get(key)
+    if cached is None:
+        question_cache_key = _question_cache_key(messages)
+        if question_cache_key is not None:
+            cached = _question_cache.get(question_cache_key)
+            if cached is not None:
+                _sql_cache.set(key, cached)
+    if cached is not None:
+        explanation, metadata, sql = cached
+        return explanation, dict(metadata), sql
+
     llm = get_llm()
 
     lc_messages = []
@@ -21,23 +98,27 @@ def generate_sql(messages: list[dict]) -> tuple[str, dict, str]:
     response = llm.invoke(lc_messages)
     response_text = response.content
 
-    return (
-        extract_explanation(response_text),
-        extract_metadata(response_text),
-        extract_sql(response_text),
-    )
+    explanation = extract_explanation(response_text)
+    metadata = extract_metadata(response_text)
+    sql = extract_sql(response_text)
+    return explanation, metadata, sql
 
 
 def extract_sql(text: str) -> str:
-    for pattern in (
-        r"```sql\s*\n?(.*?)\n?\s*```",
-        r"```\s*\n?(.*?)\n?\s*```",
-    ):
-        match = re.search(pattern, text, re.DOTALL | re.IGNORECASE)
-        if match:
-            sql = match.group(1).strip()
-            if sql:
-                return sql
+    # Prefer a ```sql block; otherwise take the first fenced block that is not
+    # the ```json METADATA block.
+    fallback = ""
+    for match in _FENCE_RE.finditer(text):
+        language = (match.group(1) or match.group(2) or "").lower()
+        body = match.group(3).strip()
+        if not body:
+            continue
+        if language == "sql":
+            return body
+        if not fallback and language != "json":
+            fallback = body
+    if fallback:
+        return fallback
 
     lines = text.split("\n")
     sql_lines: list[str] = []
@@ -55,14 +136,14 @@ def extract_sql(text: str) -> str:
 
 
 def extract_explanation(text: str) -> str:
-    match = re.search(r"EXPLANATION:\s*(.+?)(?=```|$)", text, re.DOTALL | re.IGNORECASE)
+    match = _EXPLANATION_RE.search(text)
     if match:
         return match.group(1).strip()
 
     parts = text.split("```")
     if parts:
-        explanation = parts[0].strip()
-        explanation = re.sub(r"^EXPLANATION:\s*", "", explanation, flags=re.IGNORECASE)
+        explanation = _EXPLANATION_LABEL_RE.sub("", parts[0].strip())
+        explanation = _METADATA_LABEL_RE.sub("", explanation).strip()
         if explanation:
             return explanation
 
@@ -70,23 +151,13 @@ def extract_explanation(text: str) -> str:
 
 
 def extract_metadata(text: str) -> dict:
-    match = re.search(
-        r"METADATA:\s*```json\s*(.*?)\s*```",
-        text,
-        re.DOTALL | re.IGNORECASE,
-    )
-    if match:
-        try:
-            return json.loads(match.group(1).strip())
-        except json.JSONDecodeError:
-            pass
-
-    match = re.search(r"METADATA:.*?({.*?})", text, re.DOTALL | re.IGNORECASE)
-    if match:
-        try:
-            return json.loads(match.group(1).strip())
-        except json.JSONDecodeError:
-            pass
+    for pattern in (_METADATA_FENCED_RE, _METADATA_INLINE_RE):
+        match = pattern.search(text)
+        if match:
+            try:
+                return orjson.loads(match.group(1).strip())
+            except orjson.JSONDecodeError:
+                pass
 
     return {}
 
@@ -1,14 +1,20 @@
+import functools
 import logging
-from typing import Optional, TypedDict
+import operator
+import re
+from typing import Annotated, AsyncIterator, Optional, TypedDict
 
+import anyio
 from langgraph.graph import END, StateGraph
+from langgraph.graph.state import CompiledStateGraph
 
-from app.agents.nl_to_sql.generator import generate_error_correction, generate_sql
+from app.agents.nl_to_sql.generator import generate_error_correction, generate_sql, remember_sql
 from app.agents.nl_to_sql.prompts import build_conversation_prompt
+from app.agents.nl_to_sql.template_recommender import find_template_for_question
 from app.agents.visualization.generator import generate_visualization_blueprint
 from app.query_engine.connection_pool import get_cached_engine
 from app.query_engine.executor import execute_query
-from app.query_engine.safety import validate_query
+from app.query_engine.safety import find_unknown_tables, validate_query
 
 logger = logging.getLogger("querymind.graph")
 
@@ -32,20 +38,28 @@ class ChatState(TypedDict):
     max_retries: int
     chart_recommendation: Optional[dict]
     readonly: bool
+    known_tables: list[str]
+    # Progress trail; nodes return only their new entries and LangGraph appends.
+    steps: Annotated[list[str], operator.add]
 
 
-def build_context(state: ChatState) -> dict:
-    return {}
+# One precompiled scan instead of a substring test per keyword; word
+# boundaries keep "updated_at" or "dropoff" from tripping the notice.
+_DESTRUCTIVE_RE = re.compile(r"\b(?:delete|update|insert|drop|truncate|alter)\b", re.IGNORECASE)
 
 
-_DESTRUCTIVE_KEYWORDS = {"delete", "update", "insert", "drop", "truncate", "alter"}
+async def generate_sql_node(state: ChatState) -> dict:
+    # Questions that restate a generated library template reuse its SQL.
+    template = find_template_for_question(state["connection_id"], state["user_message"])
+    if template is not None:
+        logger.info("[generate_sql] Reusing template %s", template.id)
+        explanation, metadata, sql = template.description, {}, template.sql
+        step = f"Matched library template: {template.title}"
+    else:
+        explanation, metadata, sql = await anyio.to_thread.run_sync(generate_sql, state["llm_messages"])
+        step = "Generated SQL" if sql else "No SQL generated"
 
-
-def generate_sql_node(state: ChatState) -> dict:
-    explanation, metadata, sql = generate_sql(state["llm_messages"])
-
-    user_msg = state["user_message"].lower()
-    if any(keyword in user_msg for keyword in _DESTRUCTIVE_KEYWORDS):
+    if _DESTRUCTIVE_RE.search(state["user_message"]):
         explanation = (
             "QueryMind is read-only. Data modification queries are not supported.\n\n"
             + explanation
@@ -56,33 +70,48 @@ def generate_sql_node(state: ChatState) -> dict:
         "column_metadata": metadata,
         "sql": sql,
         "error": "" if sql else "LLM did not generate any SQL query.",
+        "steps": [step],
     }
 
 
-def validate_sql_node(state: ChatState) -> dict:
+async def validate_sql_node(state: ChatState) -> dict:
     sql = state["sql"]
     if not sql:
-        return {"error": "No SQL query was generated."}
+        return {"error": "No SQL query was generated.", "steps": ["Validation failed: no SQL"]}
 
     is_safe, error_msg = validate_query(sql)
     if not is_safe:
-        return {"error": error_msg}
+        return {"error": error_msg, "steps": [f"Validation failed: {error_msg}"]}
+
+    # Catch hallucinated table names before they cost a database round-trip.
+    unknown_tables = find_unknown_tables(sql, state.get("known_tables") or [])
+    if unknown_tables:
+        return {
+            "error": (
+                f"Unknown table(s): {', '.join(unknown_tables)}. "
+                "Use only tables listed in the database schema."
+            ),
+            "steps": [f"Validation failed: unknown table(s) {', '.join(unknown_tables)}"],
+        }
 
-    return {"error": ""}
+    return {"error": "", "steps": ["Validated SQL"]}
 
 
-def execute_sql_node(state: ChatState) -> dict:
+async def execute_sql_node(state: ChatState) -> dict:
     engine = get_cached_engine(state["user_id"], state["connection_id"])
     if not engine:
-        return {"error": "Database connection not found."}
-
-    result = execute_query(
-        state["user_id"],
-        engine,
-        state["sql"],
-        row_limit=500,
-        connection_id=state["connection_id"],
-        readonly=state.get("readonly", True),
+        return {"error": "Database connection not found.", "steps": ["Database connection not found"]}
+
+    result = await anyio.to_thread.run_sync(
+        functools.partial(
+            execute_query,
+            state["user_id"],
+            engine,
+            state["sql"],
+            row_limit=500,
+            connection_id=state["connection_id"],
+            readonly=state.get("readonly", True),
+        )
     )
 
     if result.success:
@@ -91,47 +120,71 @@ def execute_sql_node(state: ChatState) -> dict:
             result.row_count,
             len(result.columns),
         )
+        # The SQL ran, so it is now safe to serve for the same question.
+        await anyio.to_thread.run_sync(
+            remember_sql,
+            state["llm_messages"],
+            state["explanation"],
+            state.get("column_metadata") or {},
+            state["sql"],
+        )
         return {
             "columns": result.columns,
             "rows": result.rows,
             "row_count": result.row_count,
             "execution_time_ms": result.execution_time_ms,
             "error": "",
+            "steps": [f"Ran query: {result.row_count} rows in {result.execution_time_ms:.0f} ms"],
         }
 
     logger.warning("[execute_sql] Error: %s", result.error)
-    return {"error": result.error or "Query execution failed."}
+    error = result.error or "Query execution failed."
+    return {"error": error, "steps": [f"Query failed: {error}"]}
 
 
-def analyze_results_node(state: ChatState) -> dict:
+async def analyze_results_node(state: ChatState) -> dict:
     columns = state.get("columns", [])
     rows = state.get("rows", [])
 
     if not columns or not rows:
-        return {"chart_recommendation": None}
-
-    blueprint = generate_visualization_blueprint(
-        user_message=state.get("user_message", ""),
-        sql=state.get("sql", ""),
-        preview_rows=rows[:5],
-        column_metadata=state.get("column_metadata", {}),
+        return {"chart_recommendation": None, "steps": ["No rows to chart"]}
+
+    blueprint = await anyio.to_thread.run_sync(
+        functools.partial(
+            generate_visualization_blueprint,
+            user_message=state.get("user_message", ""),
+            sql=state.get("sql", ""),
+            preview_rows=rows[:5],
+            column_metadata=state.get("column_metadata", {}),
+            row_count=state.get("row_count", len(rows)),
+            rows=rows,
+        )
     )
-    return {"chart_recommendation": blueprint}
+    step = f"Chose a {blueprint['type']} chart" if blueprint else "No chart recommended"
+    return {"chart_recommendation": blueprint, "steps": [step]}
 
 
-def handle_error_node(state: ChatState) -> dict:
-    explanation, metadata, corrected_sql = generate_error_correction(
-        messages=state["llm_messages"],
-        sql=state["sql"],
-        error=state["error"],
+async def handle_error_node(state: ChatState) -> dict:
+    explanation, metadata, corrected_sql = await anyio.to_thread.run_sync(
+        functools.partial(
+            generate_error_correction,
+            messages=state["llm_messages"],
+            sql=state["sql"],
+            error=state["error"],
+        )
     )
     retry_count = state["retry_count"] + 1
+    if corrected_sql:
+        step = f"Corrected SQL (attempt {retry_count})"
+    else:
+        step = f"No corrected SQL generated (attempt {retry_count})"
     return {
         "explanation": explanation,
         "column_metadata": metadata,
         "sql": corrected_sql,
         "retry_count": retry_count,
         "error": "" if corrected_sql else "LLM could not generate a corrected query.",
+        "steps": [step],
     }
 
 
@@ -151,17 +204,15 @@ def should_finish_or_retry(state: ChatState) -> str:
     return "give_up"
 
 
-def build_chat_graph() -> StateGraph:
+def build_chat_graph() -> CompiledStateGraph:
     graph = StateGraph(ChatState)
-    graph.add_node("build_context", build_context)
     graph.add_node("generate_sql", generate_sql_node)
     graph.add_node("validate_sql", validate_sql_node)
     graph.add_node("execute_sql", execute_sql_node)
     graph.add_node("analyze_results", analyze_results_node)
     graph.add_node("handle_error", handle_error_node)
 
-    graph.set_entry_point("build_context")
-    graph.add_edge("build_context", "generate_sql")
+    graph.set_entry_point("generate_sql")
     graph.add_edge("generate_sql", "validate_sql")
     graph.add_conditional_edges(
         "validate_sql",
@@ -178,17 +229,22 @@ def build_chat_graph() -> StateGraph:
     return graph.compile()
 
 
+# Compiled once at import and shared: the compiled graph holds no per-run
+# state (there is no checkpointer), so concurrent runs on the event loop are
+# safe. Nodes are async and hand their blocking LLM and database calls to
+# worker threads, so a thread is held only while a call is in flight.
 chat_graph = build_chat_graph()
 
 
-def run_chat(
+def _initial_state(
     user_id: str,
     connection_id: str,
     session_id: str,
     user_message: str,
     schema_context: str,
     history: list[dict],
-    readonly: bool = True,
+    readonly: bool,
+    known_tables: list[str] | None,
 ) -> ChatState:
     llm_messages = build_conversation_prompt(
         schema_context=schema_context,
@@ -196,7 +252,7 @@ def run_chat(
         user_message=user_message,
     )
 
-    initial_state: ChatState = {
+    return {
         "user_id": user_id,
         "connection_id": connection_id,
         "session_id": session_id,
@@ -215,5 +271,59 @@ def run_chat(
         "max_retries": 3,
         "chart_recommendation": None,
         "readonly": readonly,
+        "known_tables": known_tables or [],
+        "steps": [],
     }
-    return chat_graph.invoke(initial_state)
+
+
+async def run_chat(
+    user_id: str,
+    connection_id: str,
+    session_id: str,
+    user_message: str,
+    schema_context: str,
+    history: list[dict],
+    readonly: bool = True,
+    known_tables: list[str] | None = None,
+) -> ChatState:
+    initial_state = _initial_state(
+        user_id,
+        connection_id,
+        session_id,
+        user_message,
+        schema_context,
+        history,
+        readonly,
+        known_tables,
+    )
+    return await chat_graph.ainvoke(initial_state)
+
+
+async def stream_chat(
+    user_id: str,
+    connection_id: str,
+    session_id: str,
+    user_message: str,
+    schema_context: str,
+    history: list[dict],
+    readonly: bool = True,
+    known_tables: list[str] | None = None,
+) -> AsyncIterator[tuple[str, dict]]:
+    """Yield ``(node_name, state_update)`` pairs as each graph node finishes.
+
+    Lets callers surface the SQL and result rows while the chart blueprint
+    call is still in flight.
+    """
+    initial_state = _initial_state(
+        user_id,
+        connection_id,
+        session_id,
+        user_message,
+        schema_context,
+        history,
+        readonly,
+        known_tables,
+    )
+    async for chunk in chat_graph.astream(initial_state, stream_mode="updates"):
+        for node_name, update in chunk.items():
+            yield node_name, update or {}
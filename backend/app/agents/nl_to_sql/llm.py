@@ -1,7 +1,24 @@
+from langchain_core.runnables import Runnable
 from langchain_groq import ChatGroq
 
+from app.core.config import settings
 from app.integrations.groq_client import get_chat_groq
 
 
 def get_llm() -> ChatGroq:
     return get_chat_groq()
+
+
+def get_json_llm() -> Runnable:
+    """Fast chat model bound to Groq JSON mode so replies are a single JSON object."""
+    return get_chat_groq(model=settings.groq_model_fast).bind(response_format={"type": "json_object"})
+
+
+def get_structured_llm(name: str, schema: dict) -> Runnable:
+    """Fast chat model whose replies are constrained to ``schema`` at decode time."""
+    return get_chat_groq(model=settings.groq_model_fast).bind(
+        response_format={
+            "type": "json_schema",
+            "json_schema": {"name": name, "schema": schema},
+        }
+    )
@@ -1,20 +1,20 @@
 from pathlib import Path
 
-from app.agents._prompt_loader import load_prompt
+from app.agents._prompt_loader import load_template
 
 _PROMPTS_DIR = Path(__file__).with_name("prompts")
+_SYSTEM_PROMPT_PATH = str(_PROMPTS_DIR / "system_prompt.md")
+_TEMPLATE_RECOMMENDER_PATH = str(_PROMPTS_DIR / "template_recommender.md")
 
 
 def build_system_prompt(schema_context: str) -> str:
-    template = load_prompt(str(_PROMPTS_DIR / "system_prompt.md"))
-    return template.replace("__SCHEMA_CONTEXT__", schema_context)
+    return load_template(_SYSTEM_PROMPT_PATH).render(schema_context=schema_context)
 
 
 def build_template_recommender_prompt(schema_text: str, db_type: str) -> str:
-    template = load_prompt(str(_PROMPTS_DIR / "template_recommender.md"))
-    return (
-        template.replace("__DB_TYPE__", db_type)
-        .replace("__SCHEMA_TEXT__", schema_text)
+    return load_template(_TEMPLATE_RECOMMENDER_PATH).render(
+        db_type=db_type,
+        schema_text=schema_text,
     )
 
 
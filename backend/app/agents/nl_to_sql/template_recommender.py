@@ -1,16 +1,19 @@
-import json
+import logging
 import re
 import threading
-import traceback
 import uuid
 from dataclasses import dataclass
 from typing import Optional
 
+import orjson
 from langchain_core.messages import HumanMessage, SystemMessage
 
+from app.agents._llm_cache import question_key
 from app.agents.nl_to_sql.llm import get_llm
 from app.agents.nl_to_sql.prompts import build_template_recommender_prompt
 
+logger = logging.getLogger("querymind.templates")
+
 CATEGORY_COLORS: dict[str, str] = {
     "Sales": "#22d3a5",
     "Marketing": "#00e5ff",
@@ -32,6 +35,8 @@ CATEGORY_ICON_BG: dict[str, str] = {
 VALID_CATEGORIES = set(CATEGORY_COLORS.keys())
 VALID_DIFFICULTIES = {"beginner", "intermediate", "advanced"}
 
+_FENCE_RE = re.compile(r"```(?:json)?\s*")
+
 
 @dataclass
 class DynamicTemplate:
@@ -50,6 +55,7 @@ class DynamicTemplate:
 
 _cache: dict[str, list[DynamicTemplate]] = {}
 _by_id: dict[str, DynamicTemplate] = {}
+_by_question: dict[str, dict[str, DynamicTemplate]] = {}
 _status: dict[str, str] = {}
 _lock = threading.Lock()
 
@@ -66,11 +72,25 @@ def get_template_by_id(template_id: str) -> Optional[DynamicTemplate]:
     return _by_id.get(template_id)
 
 
+def find_template_for_question(connection_id: str, question: str) -> Optional[DynamicTemplate]:
+    """Return the generated template whose title asks the same question, if any.
+
+    Titles and questions are compared by ``question_key``, so "Top 10
+    Customers by Revenue" matches "top 10 customers by revenue?" but not
+    "top 5 ..." or "revenue by top 10 customers".
+    """
+    key = question_key(question)
+    if not key:
+        return None
+    return _by_question.get(connection_id, {}).get(key)
+
+
 def clear_connection(connection_id: str) -> None:
     with _lock:
         old = _cache.pop(connection_id, [])
         for template in old:
             _by_id.pop(template.id, None)
+        _by_question.pop(connection_id, None)
         _status.pop(connection_id, None)
 
 
@@ -113,16 +133,18 @@ def _run_generation(connection_id: str, schema_text: str, db_type: str) -> None:
             _cache[connection_id] = templates
             for template in templates:
                 _by_id[template.id] = template
+            _by_question[connection_id] = {
+                question_key(template.title): template for template in templates
+            }
             _status[connection_id] = "ready"
     except Exception:
-        traceback.print_exc()
+        logger.exception("Template generation failed for connection %s", connection_id)
         with _lock:
             _status[connection_id] = "error"
 
 
 def _parse_response(connection_id: str, raw: str) -> list[DynamicTemplate]:
-    raw = re.sub(r"```json\s*", "", raw)
-    raw = re.sub(r"```\s*", "", raw)
+    raw = _FENCE_RE.sub("", raw)
 
     start = raw.find("[")
     end = raw.rfind("]")
@@ -138,7 +160,7 @@ def _parse_response(connection_id: str, raw: str) -> list[DynamicTemplate]:
     if not raw:
         return []
 
-    data = json.loads(raw)
+    data = orjson.loads(raw)
     templates: list[DynamicTemplate] = []
 
     for item in data:
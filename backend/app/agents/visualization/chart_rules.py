@@ -0,0 +1,89 @@
+"""Rule-based chart selection for result shapes the blueprint prompt fully determines."""
+
+import re
+from functools import lru_cache
+
+from app.agents.visualization.profiling import CATEGORY, NUMERIC, TEMPORAL, group_by_kind
+
+MAX_PIE_ROWS = 7
+
+SHARE_INTENT = "share"
+VOLUME_INTENT = "volume"
+
+# Every intent keyword in one alternation so a question is scanned once.
+_INTENT_RE = re.compile(
+    r"\b(?:(?P<share>share|proportion|breakdown|composition|percentage|distribution)"
+    r"|(?P<volume>volume|growth|cumulative))\b",
+    re.IGNORECASE,
+)
+
+
+def _humanize(column: str) -> str:
+    return column.replace("_", " ").strip().title()
+
+
+def _blueprint(chart_type: str, x_column: str | None, y_columns: list[str], notes: str) -> dict:
+    y_label = _humanize(y_columns[0])
+    x_label = _humanize(x_column) if x_column else None
+    return {
+        "type": chart_type,
+        "title": f"{y_label} by {x_label}" if x_label else y_label,
+        "x_column": x_column,
+        "y_columns": y_columns,
+        "color_column": None,
+        "tooltip_columns": [],
+        "x_label": x_label,
+        "y_label": y_label,
+        "is_grouped": False,
+        "is_dual_axis": False,
+        "chart_notes": notes,
+    }
+
+
+# Re-running or editing a chat turn asks about the same question again.
+@lru_cache(maxsize=1024)
+def question_intents(question: str) -> frozenset[str]:
+    """Chart intents (share, volume) mentioned anywhere in the question."""
+    return frozenset(match.lastgroup for match in _INTENT_RE.finditer(question))
+
+
+def _time_series(groups: dict[str, list[str]]) -> bool:
+    return len(groups[NUMERIC]) == 1 and len(groups[TEMPORAL]) == 1 and not groups[CATEGORY]
+
+
+def _by_category(groups: dict[str, list[str]]) -> bool:
+    return len(groups[NUMERIC]) == 1 and len(groups[CATEGORY]) == 1 and not groups[TEMPORAL]
+
+
+# (chart type, x-axis column kind, notes, predicate over (groups, intents,
+# row_count)), checked in order; the first match wins and no match defers.
+_RULES = (
+    ("kpi", None, "Single-row result with numeric values.",
+     lambda groups, intents, row_count: row_count == 1 and bool(groups[NUMERIC])),
+    ("area", TEMPORAL, "One numeric measure over time.",
+     lambda groups, intents, row_count: _time_series(groups) and VOLUME_INTENT in intents),
+    ("line", TEMPORAL, "One numeric measure over time.",
+     lambda groups, intents, row_count: _time_series(groups)),
+    ("pie", CATEGORY, "Share of a total across a few categories.",
+     lambda groups, intents, row_count: (
+         _by_category(groups) and SHARE_INTENT in intents and row_count <= MAX_PIE_ROWS
+     )),
+    ("bar", CATEGORY, "One numeric measure per category.",
+     lambda groups, intents, row_count: _by_category(groups)),
+)
+
+
+def choose_chart(question: str, profile: dict[str, str], row_count: int) -> dict | None:
+    """Return a chart blueprint for simple result shapes, or ``None`` to defer to the LLM."""
+    groups = group_by_kind(profile)
+    intents = question_intents(question)
+
+    for chart_type, x_kind, notes, matches in _RULES:
+        if matches(groups, intents, row_count):
+            x_column = groups[x_kind][0] if x_kind else None
+            return _blueprint(chart_type, x_column, groups[NUMERIC], notes)
+
+    return None
+
+
+__all__ = ["MAX_PIE_ROWS", "SHARE_INTENT", "VOLUME_INTENT", "question_intents", "choose_chart"]
@@ -1,22 +1,37 @@
-import json
-import re
-from datetime import date, datetime, time
+import copy
 from decimal import Decimal
 from pathlib import Path
 
+import orjson
 from langchain_core.messages import HumanMessage, SystemMessage
 
+from app.agents._llm_cache import TTLCache, cache_key
 from app.agents._prompt_loader import load_prompt
-from app.agents.nl_to_sql.llm import get_llm
+from app.agents.nl_to_sql.llm import get_json_llm, get_structured_llm
+from app.agents.visualization.chart_rules import choose_chart
+from app.agents.visualization.profiling import NUMERIC, columns_of_kind, profile_columns
+from app.core.config import settings
 
 _PROMPT_PATH = Path(__file__).with_name("prompts") / "blueprint_prompt.md"
 
+_CHART_TYPES = {"bar", "line", "pie", "area", "kpi", "table"}
+
+# A blueprint is one small JSON object (~150 tokens); the cap stops a rambling
+# reply early instead of paying for the chat model's 4096-token default.
+BLUEPRINT_MAX_TOKENS = 512
+
+BLUEPRINT_CACHE_MAX_ENTRIES = 512
+BLUEPRINT_CACHE_TTL_SECONDS = 600
+
+# Keyed on the full prompt, which carries the question, SQL, metadata, and
+# preview rows, so re-running or re-opening the same result skips the call.
+_blueprint_cache = TTLCache(BLUEPRINT_CACHE_MAX_ENTRIES, BLUEPRINT_CACHE_TTL_SECONDS)
+
 
 def _json_serializable(obj):
+    # orjson handles dates and times itself; Decimal is the one DB type left.
     if isinstance(obj, Decimal):
         return float(obj)
-    if isinstance(obj, (datetime, date, time)):
-        return obj.isoformat()
     raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
 
 
@@ -26,18 +41,41 @@ def generate_visualization_blueprint(
     preview_rows: list[dict],
     column_metadata: dict,
     is_edited: bool = False,
+    row_count: int | None = None,
+    rows: list[dict] | None = None,
 ) -> dict | None:
+    """Pick a chart for a query result.
+
+    ``rows`` is the full result set and is only used to classify columns, so a
+    column whose preview values are all NULL is still typed correctly; the
+    prompt itself only carries ``preview_rows``.
+    """
     if not preview_rows:
         return None
 
+    columns = list(preview_rows[0].keys())
+    profile = profile_columns(columns, rows or preview_rows, column_metadata)
+    if row_count is None:
+        row_count = len(preview_rows)
+
+    # With no numeric column there is nothing to plot; the results table is
+    # the visualization, so skip the LLM round trip entirely.
+    if NUMERIC not in profile.values():
+        return None
+
+    blueprint = choose_chart(user_message, profile, row_count)
+    if blueprint is not None:
+        return blueprint
+
     human_message = (
         "Here is the query context.\n\n"
         f"User's Original Question: {user_message}\n\n"
         f"Generated SQL:\n{sql}\n\n"
         "Column Metadata:\n"
-        f"{json.dumps(column_metadata, indent=2, default=_json_serializable)}\n\n"
-        "Data Preview (first 5 rows):\n"
-        f"{json.dumps(preview_rows, indent=2, default=_json_serializable)}"
+        f"{orjson.dumps(column_metadata, default=_json_serializable).decode()}\n\n"
+        f"Total Rows: {row_count}\n\n"
+        f"Data Preview (first {len(preview_rows)} rows; column names, then one array per row):\n"
+        f"{_format_preview(columns, preview_rows)}"
     )
 
     if is_edited:
@@ -50,33 +88,129 @@ def generate_visualization_blueprint(
 
     human_message += "\n\nBased on this, generate the optimal chart visualization JSON blueprint."
 
-    response = get_llm().invoke(
-        [
-            SystemMessage(content=load_prompt(str(_PROMPT_PATH))),
-            HumanMessage(content=human_message),
-        ]
-    )
-    content = response.content
+    key = cache_key(human_message, profile, settings.groq_structured_outputs)
+    cached = _blueprint_cache.get(key)
+    if cached is not None:
+        return copy.deepcopy(cached)
 
-    match = re.search(r"```json\s*(.*?)\s*```", content, re.DOTALL | re.IGNORECASE)
-    if match:
-        json_str = match.group(1).strip()
+    messages = [
+        SystemMessage(content=load_prompt(str(_PROMPT_PATH))),
+        HumanMessage(content=human_message),
+    ]
+    if settings.groq_structured_outputs:
+        response = get_structured_llm("chart_blueprint", _blueprint_schema(profile)).invoke(
+            messages, max_tokens=BLUEPRINT_MAX_TOKENS
+        )
+        blueprint = _loads_object(response.content)
     else:
-        match = re.search(r"({.*})", content, re.DOTALL)
-        if not match:
-            return None
-        json_str = match.group(1).strip()
+        response = get_json_llm().invoke(messages, max_tokens=BLUEPRINT_MAX_TOKENS)
+        blueprint = _parse_blueprint(response.content)
+    if blueprint is None:
+        return None
+    blueprint = _normalize_blueprint(blueprint, profile)
+    if blueprint is not None:
+        _blueprint_cache.set(key, copy.deepcopy(blueprint))
+    return blueprint
+
+
+def _format_preview(columns: list[str], rows: list[dict]) -> str:
+    # Column names once plus positional rows instead of one indented object per
+    # row: the same information in a fraction of the prompt tokens.
+    lines = [orjson.dumps(columns).decode()]
+    lines.extend(
+        orjson.dumps([row.get(col) for col in columns], default=_json_serializable).decode()
+        for row in rows
+    )
+    return "\n".join(lines)
+
+
+def _blueprint_schema(profile: dict[str, str]) -> dict:
+    """JSON schema for a blueprint whose column fields can only name result columns."""
+    columns = list(profile)
+    numeric = columns_of_kind(profile, NUMERIC) or columns
+    optional_column = {"type": ["string", "null"], "enum": [*columns, None]}
+    optional_text = {"type": ["string", "null"]}
+    properties = {
+        "type": {"type": "string", "enum": sorted(_CHART_TYPES)},
+        "title": {"type": "string"},
+        "x_column": optional_column,
+        "y_columns": {"type": "array", "items": {"type": "string", "enum": numeric}},
+        "color_column": optional_column,
+        "tooltip_columns": {"type": "array", "items": {"type": "string", "enum": columns}},
+        "x_label": optional_text,
+        "y_label": optional_text,
+        "is_grouped": {"type": "boolean"},
+        "is_dual_axis": {"type": "boolean"},
+        "chart_notes": {"type": "string"},
+    }
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": list(properties),
+        "additionalProperties": False,
+    }
+
 
+def _loads_object(content: str) -> dict | None:
     try:
-        blueprint = json.loads(json_str)
-    except json.JSONDecodeError:
+        value = orjson.loads(content)
+    except orjson.JSONDecodeError:
+        return None
+    return value if isinstance(value, dict) else None
+
+
+def _parse_blueprint(content: str) -> dict | None:
+    # JSON mode returns a bare object; fenced or chatty output only shows up
+    # when the provider falls back to plain text.
+    # In both cases the object spans the first "{" to the last "}", which two
+    # linear scans find without regex backtracking or copying the fences.
+    blueprint = _loads_object(content)
+    if blueprint is not None:
+        return blueprint
+    start = content.find("{")
+    end = content.rfind("}")
+    if start == -1 or end < start:
         return None
+    return _loads_object(content[start : end + 1])
+
+
+def _normalize_blueprint(blueprint: dict, profile: dict[str, str]) -> dict | None:
+    """Check the model's column picks against the profiled result columns."""
+    chart_type = str(blueprint.get("type") or "").strip().lower()
+    if chart_type not in _CHART_TYPES:
+        return None
+    blueprint["type"] = chart_type
+
+    # The model's picks are untrusted JSON: keep only column names (strings)
+    # so the membership checks below never see unhashable or foreign values.
+    for key in ("y_columns", "tooltip_columns"):
+        value = blueprint.get(key)
+        if isinstance(value, str):
+            blueprint[key] = [value]
+        elif isinstance(value, list):
+            blueprint[key] = [col for col in value if isinstance(col, str)]
+        else:
+            blueprint[key] = []
+    for key in ("x_column", "color_column"):
+        if not isinstance(blueprint.get(key), str):
+            blueprint[key] = None
 
-    chart_type = blueprint.get("type")
     if chart_type == "table":
         return blueprint
-    if chart_type == "kpi" and blueprint.get("y_columns"):
+
+    # dict.fromkeys drops repeated picks while keeping the model's order.
+    blueprint["y_columns"] = [
+        col for col in dict.fromkeys(blueprint["y_columns"]) if profile.get(col) == NUMERIC
+    ]
+    blueprint["tooltip_columns"] = [col for col in dict.fromkeys(blueprint["tooltip_columns"]) if col in profile]
+    if blueprint.get("color_column") not in profile:
+        blueprint["color_column"] = None
+        blueprint["is_grouped"] = False
+
+    if not blueprint["y_columns"]:
+        return None
+    if chart_type == "kpi":
         return blueprint
-    if chart_type and blueprint.get("x_column") and blueprint.get("y_columns"):
+    if blueprint.get("x_column") in profile:
         return blueprint
     return None
@@ -0,0 +1,85 @@
+import re
+
+NUMERIC = "numeric"
+TEMPORAL = "temporal"
+CATEGORY = "category"
+
+# Query rows are serialized before they reach the agents, so dates and
+# timestamps arrive as ISO-8601 strings.
+_ISO_TEMPORAL_RE = re.compile(r"^\d{4}-\d{2}(-\d{2})?([T ]\d{2}:\d{2}(:\d{2}(\.\d+)?)?([+-]\d{2}:?\d{2}|Z)?)?$")
+_TEMPORAL_TAGS = {"date"}
+# Semantic tags from the SQL prompt for values that are labels even when they
+# are stored as numbers (IDs, codes); these are never plotted as measures.
+_CATEGORY_TAGS = {"identifier", "categorical"}
+
+
+def profile_columns(
+    columns: list[str],
+    rows: list[dict],
+    column_metadata: dict | None = None,
+) -> dict[str, str]:
+    """Classify each result column as numeric, temporal, or category.
+
+    Semantic tags in ``column_metadata`` win over the values: ``date`` columns
+    are temporal, ``identifier`` and ``categorical`` columns are categories.
+    Other columns are classified from their values. Every row is inspected
+    (nulls are skipped), so a column whose first value happens to be NULL is
+    still classified from the values that follow. The scan of a column stops
+    as soon as it can only be a category.
+    """
+    column_metadata = column_metadata or {}
+    profile: dict[str, str] = {}
+
+    for column in columns:
+        tag = str(column_metadata.get(column, "")).lower()
+        if tag in _TEMPORAL_TAGS:
+            profile[column] = TEMPORAL
+            continue
+        if tag in _CATEGORY_TAGS:
+            profile[column] = CATEGORY
+            continue
+
+        seen = False
+        numeric = temporal = True
+        for row in rows:
+            value = row.get(column)
+            if value is None:
+                continue
+            seen = True
+            if numeric and (isinstance(value, bool) or not isinstance(value, (int, float))):
+                numeric = False
+            if temporal and not (isinstance(value, str) and _ISO_TEMPORAL_RE.match(value)):
+                temporal = False
+            if not numeric and not temporal:
+                break
+
+        if seen and numeric:
+            profile[column] = NUMERIC
+        elif seen and temporal:
+            profile[column] = TEMPORAL
+        else:
+            profile[column] = CATEGORY
+
+    return profile
+
+
+def columns_of_kind(profile: dict[str, str], kind: str) -> list[str]:
+    return [column for column, column_kind in profile.items() if column_kind == kind]
+
+
+def group_by_kind(profile: dict[str, str]) -> dict[str, list[str]]:
+    """Columns per kind in a single pass over the profile, in result order."""
+    groups: dict[str, list[str]] = {NUMERIC: [], TEMPORAL: [], CATEGORY: []}
+    for column, kind in profile.items():
+        groups[kind].append(column)
+    return groups
+
+
+__all__ = [
+    "NUMERIC",
+    "TEMPORAL",
+    "CATEGORY",
+    "profile_columns",
+    "columns_of_kind",
+    "group_by_kind",
+]
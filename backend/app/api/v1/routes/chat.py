@@ -1,6 +1,8 @@
 import logging
 
+import orjson
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 
 from app.api.deps import CurrentUserDep, RateLimitChecker
 from app.api.v1.schemas.chat import (
@@ -45,6 +47,53 @@ async def send_chat_message(
         raise ServiceUnavailableError("AI processing failed for this request.") from exc
 
 
+def _sse(event: str, payload: dict) -> str:
+    return f"event: {event}\ndata: {orjson.dumps(payload, default=str).decode()}\n\n"
+
+
+@router.post("/stream")
+async def stream_chat_message(
+    request: ChatRequest,
+    current_user: CurrentUserDep,
+    _: object = Depends(RateLimitChecker("ai")),
+):
+    events = chat_service.stream_message(
+        current_user.id,
+        connection_id=request.connection_id,
+        message=request.message,
+        session_id=request.session_id,
+    )
+    # Run session setup before the response starts so lookup failures still
+    # map to regular HTTP errors instead of a broken stream.
+    try:
+        first_event = await anext(events)
+    except ValueError as exc:
+        detail = str(exc)
+        if "not found" in detail.lower():
+            raise NotFoundError(detail) from exc
+        raise BadRequestError(detail) from exc
+    except Exception as exc:
+        logger.error("Chat stream setup failed for user %s", current_user.id, exc_info=True)
+        raise ServiceUnavailableError("AI processing failed for this request.") from exc
+
+    async def event_stream():
+        yield _sse(*first_event)
+        try:
+            async for event, payload in events:
+                if event == "done":
+                    payload = ChatResponse.model_validate(payload).model_dump(mode="json")
+                yield _sse(event, payload)
+        except Exception:
+            logger.error("Chat stream failed for user %s", current_user.id, exc_info=True)
+            yield _sse("error", {"message": "AI processing failed for this request."})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/sessions", response_model=list[SessionSummary])
 async def list_sessions(current_user: CurrentUserDep):
     return await chat_service.list_sessions(current_user.id)
@@ -12,6 +12,7 @@ from app.core.secrets import (
     validate_core_credentials,
 )
 from app.core.security import decrypt, encrypt
+from app.core.text import normalized_words, stem
 
 __all__ = [
     "Settings",
@@ -27,4 +28,6 @@ __all__ = [
     "validate_core_credentials",
     "encrypt",
     "decrypt",
+    "stem",
+    "normalized_words",
 ]
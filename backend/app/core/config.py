@@ -14,6 +14,7 @@ class Settings(BaseSettings):
     app_env: str = "development"
     app_host: str = "0.0.0.0"
     app_port: int = 8000
+    app_log_level: str = "INFO"
     allowed_origins_raw: str = Field(
         default="http://localhost:5173,http://localhost:3000",
         validation_alias="ALLOWED_ORIGINS",
@@ -30,6 +31,14 @@ class Settings(BaseSettings):
 
     groq_api_key: str | None = None
     groq_model: str = "llama-3.3-70b-versatile"
+    # Smaller model for short, structured replies (chart blueprints, widget insights).
+    groq_model_fast: str = "llama-3.1-8b-instant"
+    # Constrain chart blueprints with a JSON schema; GROQ_MODEL_FAST must
+    # support Groq's json_schema response format.
+    groq_structured_outputs: bool = False
+    # SQLite file that keeps generated SQL for opening questions across
+    # restarts; unset keeps that cache in memory only.
+    sql_cache_path: str | None = None
 
     lemon_squeezy_webhook_secret: str | None = None
     lemon_squeezy_api_key: str | None = None
@@ -43,6 +52,7 @@ class Settings(BaseSettings):
         env_file_encoding="utf-8",
         extra="ignore",
         case_sensitive=False,
+        frozen=True,
     )
 
     @property
@@ -68,6 +78,7 @@ class Settings(BaseSettings):
         return {
             "app_env": self.app_env,
             "app_host": self.app_host,
+            "app_log_level": self.app_log_level,
             "app_port": self.app_port,
             "allowed_origins": self.allowed_origins,
             "backend_dev_mode": self.backend_dev_mode,
@@ -79,6 +90,9 @@ class Settings(BaseSettings):
             "has_supabase_jwt_secret": bool(self.supabase_jwt_secret),
             "has_groq_api_key": bool(self.groq_api_key),
             "groq_model": self.groq_model,
+            "groq_model_fast": self.groq_model_fast,
+            "groq_structured_outputs": self.groq_structured_outputs,
+            "sql_cache_path": self.sql_cache_path,
             "has_lemon_squeezy_webhook_secret": bool(self.lemon_squeezy_webhook_secret),
             "has_lemon_squeezy_api_key": bool(self.lemon_squeezy_api_key),
         }
@@ -5,13 +5,15 @@ import re
 from datetime import datetime
 from pathlib import Path
 
+from app.core.config import settings
 
 LOG_FILE = "startup_debug.log"
-DEFAULT_LOG_LEVEL = os.getenv("APP_LOG_LEVEL", "INFO").upper()
+DEFAULT_LOG_LEVEL = settings.app_log_level.upper()
 NOISY_LOGGERS = (
     "httpx",
     "httpcore",
     "hpack",
+    "groq",
     "postgrest",
     "supabase",
     "gotrue",
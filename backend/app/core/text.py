@@ -0,0 +1,22 @@
+import re
+
+# Numbers keep their decimals and percent sign, and comparison operators are
+# tokens of their own, so "total > 1.5%" and "total < 15" stay distinct.
+_WORD_RE = re.compile(r"\d+(?:\.\d+)?%?|[a-z0-9]+|<>|[<>!]=|[<>=]")
+
+
+def stem(word: str) -> str:
+    """Fold simple English plurals ("categories" -> "category", "orders" -> "order")."""
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+def normalized_words(text: str) -> list[str]:
+    """Lowercased, stemmed words, numbers, and operators of ``text`` in order."""
+    return [stem(word) for word in _WORD_RE.findall(text.lower())]
+
+
+__all__ = ["stem", "normalized_words"]
@@ -82,6 +82,15 @@ async def get_cached_schema(
     )
 
 
+async def get_known_relation_names(user_id: str, connection_id: str) -> list[str]:
+    """Every table and view a query on this connection may read from."""
+    schema = await get_cached_schema(user_id, connection_id)
+    if schema is None:
+        return []
+    table_names = [table.name for table in schema]
+    return table_names + connection_pool.get_cached_view_names(user_id, connection_id)
+
+
 async def refresh_schema(user_id: str, connection_id: str) -> list[TableInfo] | None:
     return await get_cached_schema(user_id, connection_id, force_refresh=True)
 
@@ -90,10 +99,16 @@ async def get_readonly(user_id: str, connection_id: str) -> bool:
     return await connection_repository.get_readonly_setting(user_id, connection_id)
 
 
-async def get_schema_for_ai(user_id: str, connection_id: str) -> str | None:
+async def get_schema_for_ai(
+    user_id: str,
+    connection_id: str,
+    question: str | None = None,
+) -> str | None:
     schema = await get_cached_schema(user_id, connection_id)
     if not schema:
         return None
+    if question:
+        schema = connection_pool.select_relevant_tables(schema, question)
     return connection_pool.build_schema_prompt_text(schema)
 
 
@@ -144,6 +159,7 @@ __all__ = [
     "get_engine",
     "get_readonly",
     "get_cached_schema",
+    "get_known_relation_names",
     "refresh_schema",
     "get_schema_for_ai",
     "seed_dev_connection",
@@ -8,7 +8,12 @@ from app.integrations.supabase_auth import (
     get_user_no_check,
 )
 from app.integrations.email import EmailDeliveryResult, EmailMessage, send_email
-from app.integrations.groq_client import get_chat_groq, get_groq_client
+from app.integrations.groq_client import (
+    close_groq_clients,
+    get_async_groq_client,
+    get_chat_groq,
+    get_groq_client,
+)
 from app.integrations.lemon_squeezy import (
     get_event_name,
     get_user_id,
@@ -35,7 +40,9 @@ __all__ = [
     "get_current_user",
     "get_user_no_check",
     "get_groq_client",
+    "get_async_groq_client",
     "get_chat_groq",
+    "close_groq_clients",
     "has_webhook_secret",
     "verify_webhook_signature",
     "parse_webhook_payload",
@@ -1,29 +1,69 @@
-from groq import Groq
+from functools import lru_cache
+
+import httpx
+from groq import AsyncGroq, Groq
 from langchain_groq import ChatGroq
 
 from app.core.config import settings
 
+# One keep-alive HTTP/2 pool per sync/async side, shared by every Groq caller
+# (SQL generation, blueprints, insights, templates) so requests reuse warm
+# TLS connections to api.groq.com instead of each client opening its own.
+_HTTP_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+_HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=32)
+
 _groq_client: Groq | None = None
-_chat_groq: ChatGroq | None = None
+_async_groq_client: AsyncGroq | None = None
 
 
 def get_groq_client() -> Groq:
     global _groq_client
     if _groq_client is None:
-        _groq_client = Groq(api_key=settings.require("groq_api_key"))
+        _groq_client = Groq(
+            api_key=settings.require("groq_api_key"),
+            http_client=httpx.Client(http2=True, timeout=_HTTP_TIMEOUT, limits=_HTTP_LIMITS),
+        )
     return _groq_client
 
 
-def get_chat_groq() -> ChatGroq:
-    global _chat_groq
-    if _chat_groq is None:
-        _chat_groq = ChatGroq(
+def get_async_groq_client() -> AsyncGroq:
+    global _async_groq_client
+    if _async_groq_client is None:
+        _async_groq_client = AsyncGroq(
             api_key=settings.require("groq_api_key"),
-            model=settings.groq_model,
-            temperature=0,
-            max_tokens=4096,
+            http_client=httpx.AsyncClient(http2=True, timeout=_HTTP_TIMEOUT, limits=_HTTP_LIMITS),
         )
-    return _chat_groq
+    return _async_groq_client
+
+
+async def close_groq_clients() -> None:
+    global _groq_client, _async_groq_client
+    # Cached chat models hold the clients' completion resources; drop them so
+    # the next caller builds fresh ones instead of using closed connections.
+    _chat_groq.cache_clear()
+    if _groq_client is not None:
+        _groq_client.close()
+        _groq_client = None
+    if _async_groq_client is not None:
+        await _async_groq_client.close()
+        _async_groq_client = None
+
+
+def get_chat_groq(temperature: float = 0.0, model: str | None = None) -> ChatGroq:
+    """Shared chat model per (temperature, model) so agents reuse one client."""
+    return _chat_groq(float(temperature), model or settings.groq_model)
+
+
+@lru_cache(maxsize=8)
+def _chat_groq(temperature: float, model: str) -> ChatGroq:
+    return ChatGroq(
+        api_key=settings.require("groq_api_key"),
+        model=model,
+        temperature=temperature,
+        max_tokens=4096,
+        client=get_groq_client().chat.completions,
+        async_client=get_async_groq_client().chat.completions,
+    )
 
 
-__all__ = ["get_groq_client", "get_chat_groq"]
+__all__ = ["get_groq_client", "get_async_groq_client", "get_chat_groq", "close_groq_clients"]
@@ -9,6 +9,7 @@ logger = logging.getLogger(__name__)
 
 @asynccontextmanager
 async def lifespan(_: FastAPI):
+    from app.integrations.groq_client import close_groq_clients
     from app.services.connection_service import seed_dev_connection
     from app.workers.scheduler import (
         initialize_workers,
@@ -36,3 +37,4 @@ async def lifespan(_: FastAPI):
 
     logger.info("[startup] Shutting down.")
     shutdown_workers()
+    await close_groq_clients()
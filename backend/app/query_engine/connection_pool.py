@@ -4,7 +4,7 @@ import time
 from typing import Optional
 
 import anyio
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.engine import Engine, URL, make_url
 
 try:
@@ -12,7 +12,9 @@ try:
 except ModuleNotFoundError:  # pragma: no cover - environment-dependent optional import
     SSHTunnelForwarder = None
 
+from app.core.text import normalized_words
 from app.db.models.connection import ConnectionRequest, TableInfo
+from app.query_engine.executor import QUERY_TIMEOUT
 import app.query_engine.schema_inspector as schema_inspector
 
 
@@ -22,9 +24,14 @@ _engines: dict[tuple[str, str], Engine] = {}
 _tunnels: dict[tuple[str, str], SSHTunnelForwarder] = {}
 _engine_access_times: dict[tuple[str, str], float] = {}
 _schema_cache: dict[tuple[str, str], tuple[list[TableInfo], float]] = {}
+_schema_locks: dict[tuple[str, str], anyio.Lock] = {}
+# View names are inspected alongside the schema; they are not part of it (no
+# columns or row counts are collected) but are valid query targets.
+_view_cache: dict[tuple[str, str], list[str]] = {}
 
 MAX_CACHED_ENGINES = 50
 SCHEMA_CACHE_TTL_SECONDS = 600
+SCHEMA_FILTER_MIN_TABLES = 12
 
 
 def _evict_lru_engine() -> None:
@@ -84,12 +91,23 @@ def start_ssh_tunnel(config: ConnectionRequest) -> tuple[Optional[SSHTunnelForwa
     return tunnel, "127.0.0.1", tunnel.local_bind_port
 
 
+def _set_postgres_statement_timeout(dbapi_connection, _connection_record) -> None:
+    # Session-level setting applied once per pooled connection instead of
+    # costing an extra round trip on every query.
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"SET statement_timeout = {QUERY_TIMEOUT * 1000}")
+    finally:
+        cursor.close()
+    dbapi_connection.commit()
+
+
 def build_engine(url: URL, db_type: str, ssl_mode: str = "disable") -> Engine:
     connect_args = {}
     if db_type in ["postgresql", "mariadb", "mysql"] and ssl_mode != "disable":
         connect_args["sslmode"] = ssl_mode
 
-    return create_engine(
+    engine = create_engine(
         url,
         connect_args=connect_args,
         pool_pre_ping=True,
@@ -97,6 +115,9 @@ def build_engine(url: URL, db_type: str, ssl_mode: str = "disable") -> Engine:
         pool_size=5,
         max_overflow=10,
     )
+    if db_type == "postgresql":
+        event.listen(engine, "connect", _set_postgres_statement_timeout)
+    return engine
 
 
 async def test_connection(config: ConnectionRequest) -> tuple[bool, str]:
@@ -153,6 +174,8 @@ def release_connection(user_id: str, connection_id: str) -> None:
     tunnel = _tunnels.pop(key, None)
     _engine_access_times.pop(key, None)
     _schema_cache.pop(key, None)
+    _view_cache.pop(key, None)
+    _schema_locks.pop(key, None)
     if engine:
         engine.dispose()
     if tunnel:
@@ -166,22 +189,83 @@ async def get_cached_schema(
     force_refresh: bool = False,
 ) -> list[TableInfo] | None:
     key = (user_id, connection_id)
-    now = time.monotonic()
-
     if not force_refresh:
-        cached = _schema_cache.get(key)
-        if cached:
-            schema, ts = cached
-            if now - ts < SCHEMA_CACHE_TTL_SECONDS:
+        schema = _fresh_cached_schema(key)
+        if schema is not None:
+            return schema
+
+    # Concurrent misses for one connection share a single catalog inspection.
+    lock = _schema_locks.setdefault(key, anyio.Lock())
+    async with lock:
+        if not force_refresh:
+            schema = _fresh_cached_schema(key)
+            if schema is not None:
                 return schema
 
-    engine = await engine_loader(user_id, connection_id)
-    if not engine:
-        return None
+        engine = await engine_loader(user_id, connection_id)
+        if not engine:
+            return None
+
+        schema = await anyio.to_thread.run_sync(schema_inspector.get_schema, engine)
+        _view_cache[key] = await anyio.to_thread.run_sync(schema_inspector.get_view_names, engine)
+        _schema_cache[key] = (schema, time.monotonic())
+        return schema
+
+
+def get_cached_view_names(user_id: str, connection_id: str) -> list[str]:
+    """View names recorded by the last schema inspection of this connection."""
+    return list(_view_cache.get((user_id, connection_id), []))
+
+
+def _fresh_cached_schema(key: tuple[str, str]) -> list[TableInfo] | None:
+    cached = _schema_cache.get(key)
+    if cached:
+        schema, ts = cached
+        if time.monotonic() - ts < SCHEMA_CACHE_TTL_SECONDS:
+            return schema
+    return None
+
+
+def _stems(text: str) -> set[str]:
+    return set(normalized_words(text))
+
+
+def _names_column(column_name: str, context_stems: set[str]) -> bool:
+    # Every meaningful word of the column must appear ("unit_price" needs
+    # both), so short or shared fragments like "id" and "at" never match.
+    stems = {stem for stem in _stems(column_name) if len(stem) >= 3}
+    return bool(stems) and stems <= context_stems
+
+
+def select_relevant_tables(schema: list[TableInfo], context: str) -> list[TableInfo]:
+    """Narrow a large schema to tables ``context`` mentions plus their FK neighbours.
+
+    A table is mentioned when its name or one of its column names appears in
+    the context. Small schemas, and contexts that mention no table, are
+    returned unchanged so the model never loses tables it might need.
+    """
+    if len(schema) < SCHEMA_FILTER_MIN_TABLES:
+        return schema
+
+    context_stems = _stems(context)
+    matched = {
+        table.name
+        for table in schema
+        if any(len(stem) >= 3 and stem in context_stems for stem in _stems(table.name))
+        or any(_names_column(column.name, context_stems) for column in table.columns)
+    }
+    if not matched:
+        return schema
+
+    related = set(matched)
+    for table in schema:
+        referred = {fk.referred_table for fk in table.foreign_keys}
+        if table.name in matched:
+            related |= referred
+        elif referred & matched:
+            related.add(table.name)
 
-    schema = await anyio.to_thread.run_sync(schema_inspector.get_schema, engine)
-    _schema_cache[key] = (schema, now)
-    return schema
+    return [table for table in schema if table.name in related]
 
 
 def build_schema_prompt_text(schema: list[TableInfo]) -> str:
@@ -210,5 +294,7 @@ __all__ = [
     "get_cached_engine",
     "release_connection",
     "get_cached_schema",
+    "get_cached_view_names",
+    "select_relevant_tables",
     "build_schema_prompt_text",
 ]
@@ -1,4 +1,7 @@
+import logging
+import re
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 from sqlalchemy import text
@@ -6,11 +9,21 @@ from sqlalchemy.engine import Engine
 
 from app.db.repositories.query_history_repository import log_query as log_query_history
 from app.query_engine.results import QueryExecutionResult
-from app.query_engine.result_serializer import serialize_data
+from app.query_engine.result_serializer import serialize_rows
 from app.query_engine.safety import sanitize_row_limit, validate_query
 
 QUERY_TIMEOUT = 30
 
+logger = logging.getLogger(__name__)
+
+# Postgres runs streamed (server-side cursor) statements as DECLARE ... CURSOR,
+# which only accepts queries; EXPLAIN, SHOW, and friends are fetched normally.
+_STREAMABLE_RE = re.compile(r"^\s*\(*\s*(?:SELECT|WITH)\b", re.IGNORECASE)
+
+# History rows are written off the request path so the caller (e.g. the chat
+# graph's chart blueprint step) can start while the Supabase insert runs.
+_history_writer = ThreadPoolExecutor(max_workers=4, thread_name_prefix="query-history")
+
 
 def _apply_readonly_guards(conn, dialect_name: str) -> None:
     if dialect_name in {"postgresql", "mysql", "mariadb"}:
@@ -30,16 +43,17 @@ def execute_query(
         if not is_safe:
             return QueryExecutionResult(success=False, error=error_msg)
 
+    # One row past the limit tells a full result apart from a truncated one;
+    # query history records the limit the user actually gets.
     safe_sql = sanitize_row_limit(sql, row_limit)
+    executed_sql = sanitize_row_limit(sql, row_limit + 1)
     start_time = time.time()
 
     try:
         with engine.connect() as conn:
+            # statement_timeout is set once per pooled connection by
+            # connection_pool.build_engine.
             transaction = conn.begin()
-            try:
-                conn.execute(text(f"SET statement_timeout = '{QUERY_TIMEOUT * 1000}'"))
-            except Exception:
-                pass
 
             if readonly:
                 try:
@@ -56,12 +70,19 @@ def execute_query(
                         sql,
                     )
 
-            result = conn.execute(text(safe_sql))
+            # A LIMIT written into the SQL (or one inside a subquery) can exceed
+            # row_limit, so stream queries through a server-side cursor where
+            # the driver supports it and never pull more than row_limit + 1 rows.
+            statement = text(executed_sql)
+            if _STREAMABLE_RE.match(executed_sql):
+                statement = statement.execution_options(stream_results=True)
+            result = conn.execute(statement)
             columns = list(result.keys())
-            raw_rows = [dict(row._mapping) for row in result.fetchall()]
-            rows = serialize_data(raw_rows)
+            fetched = result.fetchmany(row_limit + 1)
+            result.close()
+            rows = serialize_rows(columns, fetched[:row_limit])
             elapsed = (time.time() - start_time) * 1000
-            truncated = len(rows) >= row_limit
+            truncated = len(fetched) > row_limit
             transaction.rollback()
 
             return _log_and_return(
@@ -118,19 +139,24 @@ def _log_and_return(
     sql: str,
 ) -> QueryExecutionResult:
     if connection_id:
-        try:
-            log_query_history(
-                user_id=user_id,
-                connection_id=connection_id,
-                sql=sql,
-                success=result.success,
-                error=result.error,
-                execution_time_ms=result.execution_time_ms,
-                row_count=result.row_count,
-            )
-        except Exception:
-            pass
+        _history_writer.submit(
+            _log_query_quietly,
+            user_id=user_id,
+            connection_id=connection_id,
+            sql=sql,
+            success=result.success,
+            error=result.error,
+            execution_time_ms=result.execution_time_ms,
+            row_count=result.row_count,
+        )
     return result
 
 
+def _log_query_quietly(**record) -> None:
+    try:
+        log_query_history(**record)
+    except Exception:
+        logger.debug("Failed to record query history", exc_info=True)
+
+
 __all__ = ["QUERY_TIMEOUT", "execute_query"]
@@ -1,6 +1,8 @@
 import datetime
 import decimal
-from typing import Any
+from typing import Any, Sequence
+
+_JSON_NATIVE_TYPES = frozenset({str, int, float, bool, type(None)})
 
 
 def serialize_data(obj: Any) -> Any:
@@ -16,4 +18,21 @@ def serialize_data(obj: Any) -> Any:
     return obj
 
 
-__all__ = ["serialize_data"]
+def serialize_rows(columns: list[str], rows: Sequence[Sequence[Any]]) -> list[dict]:
+    """Convert fetched row tuples into JSON-serializable dicts, one column at a time.
+
+    Value types are checked once per column, so only columns that actually hold
+    Decimal, date/time, or nested values are walked by ``serialize_data``.
+    """
+    if not rows:
+        return []
+
+    column_values: list[Sequence[Any]] = list(zip(*rows))
+    for index, values in enumerate(column_values):
+        if not _JSON_NATIVE_TYPES.issuperset(map(type, values)):
+            column_values[index] = [serialize_data(value) for value in values]
+
+    return [dict(zip(columns, row)) for row in zip(*column_values)]
+
+
+__all__ = ["serialize_data", "serialize_rows"]
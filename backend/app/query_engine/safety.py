@@ -1,4 +1,5 @@
 import re
+from typing import Iterable
 
 
 BLOCKED_KEYWORDS = [
@@ -60,6 +61,94 @@ def validate_query(sql: str) -> tuple[bool, str]:
     return True, ""
 
 
+_IDENTIFIER = r'(?:"[^"]+"|[A-Za-z_][\w$]*)'
+# One left-to-right scan over string literals and quoted identifiers, so a
+# quote character inside one never opens the other.
+_QUOTED_PATTERN = re.compile(r"'(?:[^']|'')*'|\"((?:[^\"]|\"\")*)\"|`([^`]*)`")
+_QUOTED_PLACEHOLDER_PATTERN = re.compile(r"__quoted_(\d+)__")
+# FROM inside these expressions introduces a value, not a table.
+_VALUE_FROM_PATTERN = re.compile(
+    r"\b(?:EXTRACT|SUBSTRING|TRIM|OVERLAY|POSITION)\s*\([^()]*\)|\bDISTINCT\s+FROM\b",
+    re.IGNORECASE,
+)
+_CTE_NAME_PATTERN = re.compile(
+    rf"(?:\bWITH(?:\s+RECURSIVE)?|,)\s*({_IDENTIFIER})\s*(?:\([^()]*\)\s*)?"
+    r"AS\s*(?:NOT\s+)?(?:MATERIALIZED\s*)?\(",
+    re.IGNORECASE,
+)
+_TABLE_REF_PATTERN = re.compile(
+    rf"\b(?:FROM|JOIN)\s+(?:ONLY\s+|LATERAL\s+)?({_IDENTIFIER}(?:\s*\.\s*{_IDENTIFIER})?)(\s*\()?",
+    re.IGNORECASE,
+)
+_SYSTEM_SCHEMAS = {"information_schema", "pg_catalog"}
+# Built-in one-row tables that never appear in a schema listing.
+_PSEUDO_TABLES = {"dual"}
+
+
+def _normalize_table_ref(ref: str, quoted: list[str] | None = None) -> str:
+    parts = []
+    for part in ref.split("."):
+        part = part.strip().strip('"')
+        placeholder = _QUOTED_PLACEHOLDER_PATTERN.fullmatch(part)
+        if placeholder and quoted is not None:
+            part = quoted[int(placeholder.group(1))]
+        parts.append(part.lower())
+    return ".".join(parts)
+
+
+def _mask_quoted(sql: str) -> tuple[str, list[str]]:
+    """Blank string literals and swap quoted identifiers for placeholders.
+
+    Quoted aliases such as ``AS "Revenue From Returns"`` can hold FROM or
+    JOIN; as placeholders they can no longer look like table references,
+    while a quoted table name is restored from ``quoted`` when it is one.
+    """
+    quoted: list[str] = []
+
+    def replace(match: re.Match) -> str:
+        if match.group(1) is None and match.group(2) is None:
+            return "''"
+        quoted.append(match.group(1).replace('""', '"') if match.group(1) is not None else match.group(2))
+        return f"__quoted_{len(quoted) - 1}__"
+
+    return _QUOTED_PATTERN.sub(replace, sql), quoted
+
+
+def find_unknown_tables(sql: str, known_tables: Iterable[str]) -> list[str]:
+    """Return tables referenced in FROM/JOIN clauses that are not in ``known_tables``.
+
+    CTE names, table functions, system catalogs, and ``dual`` are ignored. An
+    empty ``known_tables`` disables the check.
+    """
+    known = {_normalize_table_ref(name) for name in known_tables}
+    if not known:
+        return []
+    known |= {name.rsplit(".", 1)[-1] for name in known}
+
+    cleaned = re.sub(r"--.*$", "", sql, flags=re.MULTILINE)
+    cleaned = re.sub(r"/\*.*?\*/", "", cleaned, flags=re.DOTALL)
+    cleaned, quoted = _mask_quoted(cleaned)
+    cleaned = _VALUE_FROM_PATTERN.sub(" ", cleaned)
+
+    cte_names = {_normalize_table_ref(name, quoted) for name in _CTE_NAME_PATTERN.findall(cleaned)}
+
+    unknown: list[str] = []
+    for ref, call_paren in _TABLE_REF_PATTERN.findall(cleaned):
+        if call_paren:
+            continue
+        name = _normalize_table_ref(ref, quoted)
+        schema_name, _, bare_name = name.rpartition(".")
+        if name in cte_names or schema_name in _SYSTEM_SCHEMAS or bare_name.startswith("pg_"):
+            continue
+        if name in _PSEUDO_TABLES:
+            continue
+        if name in known or bare_name in known:
+            continue
+        if name not in unknown:
+            unknown.append(name)
+    return unknown
+
+
 def get_readonly_wrapped_query(sql: str) -> str:
     sql = sql.rstrip(";").strip()
     return f"SET TRANSACTION READ ONLY; {sql};"
@@ -75,6 +164,7 @@ def sanitize_row_limit(sql: str, max_rows: int) -> str:
 
 __all__ = [
     "validate_query",
+    "find_unknown_tables",
     "get_readonly_wrapped_query",
     "sanitize_row_limit",
 ]
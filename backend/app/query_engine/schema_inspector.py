@@ -85,6 +85,20 @@ def get_table_names(engine: Engine) -> list[str]:
     return table_names
 
 
+def get_view_names(engine: Engine) -> list[str]:
+    """Views and, where the dialect has them, materialized views."""
+    inspector = inspect(engine)
+    view_names: list[str] = []
+    for schema_name in _get_user_schema_names(inspector):
+        for list_views in (inspector.get_view_names, inspector.get_materialized_view_names):
+            try:
+                names = list_views(schema=schema_name)
+            except Exception:
+                continue
+            view_names.extend(_display_table_name(schema_name, name) for name in names)
+    return view_names
+
+
 def get_schema(engine: Engine) -> list[TableInfo]:
     """Discover full schema: tables, columns, PKs, FKs, and approximate row counts."""
     inspector = inspect(engine)
@@ -221,6 +235,7 @@ def generate_erd_json(schema: list[TableInfo]) -> dict:
 
 __all__ = [
     "get_table_names",
+    "get_view_names",
     "get_schema",
     "generate_erd_mermaid",
     "generate_erd_json",
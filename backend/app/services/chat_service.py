@@ -1,10 +1,12 @@
 """Chat workflows."""
 
+import asyncio
 import functools
+from typing import AsyncIterator
 
 import anyio
 
-from app.agents.nl_to_sql.graph import run_chat
+from app.agents.nl_to_sql.graph import run_chat, stream_chat
 from app.agents.visualization.generator import generate_visualization_blueprint
 from app.db.models.chat import ChatMessage, SessionSummary
 from app.db.repositories.chat_repository import (
@@ -23,6 +25,9 @@ from app.db.repositories.chat_repository import (
 from app.services import connection_service, query_execution_service
 
 
+_SQL_NODES = {"generate_sql", "handle_error"}
+
+
 def _sanitize_chart_recommendation(chart_rec: dict | None) -> dict | None:
     if chart_rec and isinstance(chart_rec, dict):
         if chart_rec.get("y_columns") is None:
@@ -32,20 +37,29 @@ def _sanitize_chart_recommendation(chart_rec: dict | None) -> dict | None:
     return chart_rec
 
 
-async def send_message(
+async def _start_turn(
     user_id: str,
     connection_id: str,
     message: str,
-    session_id: str | None = None,
+    session_id: str | None,
 ) -> dict:
+    """Resolve the session, persist the user message, and build graph inputs."""
     engine = await connection_service.get_engine(user_id, connection_id)
     if not engine:
         raise ValueError("Database connection not found. Connect first.")
 
-    readonly = await connection_service.get_readonly(user_id, connection_id)
-    schema_context = await connection_service.get_schema_for_ai(user_id, connection_id)
+    # Only an opening question narrows the schema: a follow-up such as "now
+    # only last week" still relies on tables from earlier turns it does not name.
+    question = message if session_id is None else None
+    # Readonly flag and schema context are independent lookups; overlap them.
+    readonly, schema_context = await asyncio.gather(
+        connection_service.get_readonly(user_id, connection_id),
+        connection_service.get_schema_for_ai(user_id, connection_id, question=question),
+    )
     if not schema_context:
         schema_context = "No schema available. Please connect to a database first."
+    # Served from the schema cache the lookup above just filled.
+    known_tables = await connection_service.get_known_relation_names(user_id, connection_id)
 
     is_new_session = False
     if not session_id:
@@ -57,15 +71,17 @@ async def send_message(
         if not session:
             raise ValueError("Session not found.")
 
-    await track_connection(user_id, session_id, connection_id)
-
+    bookkeeping = [
+        track_connection(user_id, session_id, connection_id),
+        get_latest_user_message_id(user_id, session_id),
+    ]
     if is_new_session:
         title = message[:50].strip()
         if len(message) > 50:
             title += "..."
-        await rename_session(user_id, session_id, title)
+        bookkeeping.append(rename_session(user_id, session_id, title))
 
-    prev_query_id = await get_latest_user_message_id(user_id, session_id) if session_id else None
+    _, prev_query_id, *_ = await asyncio.gather(*bookkeeping)
     user_msg = ChatMessage(
         role="user",
         content=message,
@@ -75,20 +91,28 @@ async def send_message(
     await add_message(user_id, session_id, user_msg)
     history = await get_history_for_llm(user_id, session_id)
 
-    result = await anyio.to_thread.run_sync(
-        functools.partial(
-            run_chat,
-            user_id=user_id,
-            connection_id=connection_id,
-            session_id=session_id,
-            user_message=message,
-            schema_context=schema_context,
-            history=history,
-            readonly=readonly,
-        )
-    )
+    return {
+        "session_id": session_id,
+        "user_msg": user_msg,
+        "prev_query_id": prev_query_id,
+        "graph_kwargs": {
+            "user_id": user_id,
+            "connection_id": connection_id,
+            "session_id": session_id,
+            "user_message": message,
+            "schema_context": schema_context,
+            "history": history,
+            "readonly": readonly,
+            "known_tables": known_tables,
+        },
+    }
+
+
+async def _finish_turn(user_id: str, connection_id: str, turn: dict, result: dict) -> dict:
+    """Persist the assistant reply and shape the API response payload."""
+    session_id = turn["session_id"]
+    user_msg = turn["user_msg"]
 
-    assistant_msg_id = ""
     assistant_msg = ChatMessage(
         role="assistant",
         content=result.get("explanation", ""),
@@ -100,14 +124,13 @@ async def send_message(
         error=result.get("error"),
         parent_id=user_msg.id,
     )
-    assistant_msg_id = assistant_msg.id
     await add_message(user_id, session_id, assistant_msg)
 
     chart_rec = _sanitize_chart_recommendation(result.get("chart_recommendation"))
     error = result.get("error", "")
     return {
         "session_id": session_id,
-        "message_id": assistant_msg_id,
+        "message_id": assistant_msg.id,
         "user_message_id": user_msg.id,
         "message": result.get("explanation", ""),
         "sql": result.get("sql"),
@@ -119,10 +142,63 @@ async def send_message(
         "error": error if error else None,
         "column_metadata": result.get("column_metadata", {}),
         "is_pinned": False,
-        "prev_query_id": prev_query_id,
+        "prev_query_id": turn["prev_query_id"],
     }
 
 
+async def send_message(
+    user_id: str,
+    connection_id: str,
+    message: str,
+    session_id: str | None = None,
+) -> dict:
+    turn = await _start_turn(user_id, connection_id, message, session_id)
+    result = await run_chat(**turn["graph_kwargs"])
+    return await _finish_turn(user_id, connection_id, turn, result)
+
+
+async def stream_message(
+    user_id: str,
+    connection_id: str,
+    message: str,
+    session_id: str | None = None,
+) -> AsyncIterator[tuple[str, dict]]:
+    """Yield ``(event, payload)`` pairs while the chat graph runs.
+
+    Each node's progress entries are emitted as ``step`` events, and SQL and
+    result rows as soon as their nodes finish, so the client can render the
+    table before the chart blueprint arrives. The last event is ``done`` with
+    the same payload ``send_message`` returns.
+    """
+    turn = await _start_turn(user_id, connection_id, message, session_id)
+    yield "session", {"session_id": turn["session_id"], "user_message_id": turn["user_msg"].id}
+
+    result: dict = {}
+    async for node_name, update in stream_chat(**turn["graph_kwargs"]):
+        result.update(update)
+
+        for step in update.get("steps", []):
+            yield "step", {"node": node_name, "message": step}
+
+        if node_name in _SQL_NODES and update.get("sql"):
+            yield "sql", {"sql": update["sql"], "message": update.get("explanation", "")}
+        elif node_name == "execute_sql" and not update.get("error"):
+            yield "results", {
+                "columns": update.get("columns", []),
+                "rows": update.get("rows", []),
+                "row_count": update.get("row_count", 0),
+                "execution_time_ms": update.get("execution_time_ms", 0.0),
+            }
+        elif node_name == "analyze_results":
+            yield "chart", {
+                "chart_recommendation": _sanitize_chart_recommendation(
+                    update.get("chart_recommendation")
+                )
+            }
+
+    yield "done", await _finish_turn(user_id, connection_id, turn, result)
+
+
 async def create_session_summary(user_id: str, connection_id: str | None = None) -> SessionSummary:
     if connection_id:
         engine = await connection_service.get_engine(user_id, connection_id)
@@ -185,14 +261,15 @@ async def edit_message_sql(
     sql: str,
     connection_id: str,
 ) -> ChatMessage:
-    result = await query_execution_service.execute_for_connection(
-        user_id=user_id,
-        connection_id=connection_id,
-        sql=sql,
-        row_limit=500,
+    result, history = await asyncio.gather(
+        query_execution_service.execute_for_connection(
+            user_id=user_id,
+            connection_id=connection_id,
+            sql=sql,
+            row_limit=500,
+        ),
+        get_history_for_llm(user_id, session_id),
     )
-
-    history = await get_history_for_llm(user_id, session_id)
     user_msg_context = "Custom SQL query"
     for history_message in history:
         if history_message["role"] == "user":
@@ -208,6 +285,8 @@ async def edit_message_sql(
                 preview_rows=result.rows[:5],
                 column_metadata={},
                 is_edited=True,
+                row_count=result.row_count,
+                rows=result.rows,
             )
         )
 
@@ -252,6 +331,7 @@ async def toggle_pin_status(
 
 __all__ = [
     "send_message",
+    "stream_message",
     "create_session_summary",
     "update_session_summary",
     "get_session_messages_response",
@@ -9,6 +9,7 @@ from app.db.connection_manager import (
     get_all_connections,
     get_cached_schema,
     get_engine,
+    get_known_relation_names,
     get_readonly,
     get_schema_for_ai,
     refresh_schema,
@@ -26,6 +27,7 @@ __all__ = [
     "get_all_connections",
     "get_cached_schema",
     "get_engine",
+    "get_known_relation_names",
     "get_readonly",
     "get_schema_for_ai",
     "refresh_schema",
@@ -2,7 +2,7 @@
 
 from typing import Optional
 
-from app.agents.insights.generator import generate_widget_insight
+from app.agents.insights.generator import agenerate_widget_insight
 from app.db.models.dashboard import (
     AddWidgetInput,
     CreateDashboardInput,
@@ -145,7 +145,7 @@ async def build_widget_insight(user_id: str, widget_id: str) -> str:
         raise ValueError("Widget not found.")
 
     dashboard = await get_dashboard(user_id, widget.dashboard_id)
-    return generate_widget_insight(
+    return await agenerate_widget_insight(
         widget.title,
         widget.viz_type,
         widget.rows,
@@ -0,0 +1,10 @@
+"""Shared pytest setup.
+
+Importing ``app.agents`` builds the Supabase and Groq clients from settings,
+so placeholder values are provided for unit tests that never reach them.
+"""
+import os
+
+os.environ.setdefault("SUPABASE_URL", "https://test.supabase.co")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "eyJ.test.service-role-key")
+os.environ.setdefault("GROQ_API_KEY", "test-groq-api-key")
@@ -0,0 +1,123 @@
+"""Unit tests for backend/app/agents/visualization/generator.py"""
+import pytest
+from app.agents.visualization import generator
+from app.agents.visualization.generator import _normalize_blueprint, generate_visualization_blueprint
+from app.agents.visualization.profiling import CATEGORY, NUMERIC
+
+PROFILE = {"region": CATEGORY, "revenue": NUMERIC, "orders": NUMERIC}
+
+
+def _blueprint(**overrides):
+    blueprint = {
+        "type": "bar",
+        "x_column": "region",
+        "y_columns": ["revenue"],
+        "color_column": None,
+        "tooltip_columns": [],
+    }
+    blueprint.update(overrides)
+    return blueprint
+
+
+# ---------------------------------------------------------------------------
+# _normalize_blueprint
+# ---------------------------------------------------------------------------
+
+class TestNormalizeBlueprint:
+    def test_valid_blueprint_passes(self):
+        result = _normalize_blueprint(_blueprint(), PROFILE)
+        assert (result["x_column"], result["y_columns"]) == ("region", ["revenue"])
+
+    def test_unknown_chart_type(self):
+        assert _normalize_blueprint(_blueprint(type="sankey"), PROFILE) is None
+
+    def test_single_string_y_column(self):
+        assert _normalize_blueprint(_blueprint(y_columns="revenue"), PROFILE)["y_columns"] == ["revenue"]
+
+    def test_drops_duplicate_and_non_numeric_y_columns(self):
+        result = _normalize_blueprint(_blueprint(y_columns=["revenue", "region", "revenue", "orders"]), PROFILE)
+        assert result["y_columns"] == ["revenue", "orders"]
+
+    @pytest.mark.parametrize(
+        "y_columns",
+        [[{"column": "revenue"}], [["revenue"]], 5, {"revenue": True}],
+    )
+    def test_malformed_y_columns_are_rejected(self, y_columns):
+        assert _normalize_blueprint(_blueprint(y_columns=y_columns), PROFILE) is None
+
+    def test_non_string_items_are_dropped(self):
+        result = _normalize_blueprint(_blueprint(y_columns=[{"column": "x"}, "revenue", 3]), PROFILE)
+        assert result["y_columns"] == ["revenue"]
+
+    @pytest.mark.parametrize("x_column", [["region"], {"name": "region"}, 7])
+    def test_non_string_x_column_is_missing(self, x_column):
+        assert _normalize_blueprint(_blueprint(x_column=x_column), PROFILE) is None
+
+    @pytest.mark.parametrize("color_column", [["region"], {"name": "region"}, "nope"])
+    def test_invalid_color_column_is_cleared(self, color_column):
+        result = _normalize_blueprint(_blueprint(color_column=color_column, is_grouped=True), PROFILE)
+        assert result["color_column"] is None
+        assert result["is_grouped"] is False
+
+    def test_malformed_tooltips_are_cleaned(self):
+        result = _normalize_blueprint(_blueprint(tooltip_columns=[["a"], "orders", "missing"]), PROFILE)
+        assert result["tooltip_columns"] == ["orders"]
+
+    def test_kpi_needs_no_x_column(self):
+        result = _normalize_blueprint(_blueprint(type="KPI", x_column=None), PROFILE)
+        assert result["type"] == "kpi"
+
+    def test_table_is_kept_with_cleaned_lists(self):
+        result = _normalize_blueprint(_blueprint(type="table", y_columns=5, x_column=[1]), PROFILE)
+        assert (result["type"], result["y_columns"], result["x_column"]) == ("table", [], None)
+
+
+# ---------------------------------------------------------------------------
+# Blueprint cache
+# ---------------------------------------------------------------------------
+
+# Two numeric columns and a category: no rule applies, so the LLM is asked.
+ROWS = [
+    {"region": "north", "revenue": 10, "orders": 1},
+    {"region": "south", "revenue": 20, "orders": 2},
+]
+
+
+class StubLLM:
+    def __init__(self):
+        self.calls = 0
+
+    def invoke(self, messages, **kwargs):
+        self.calls += 1
+        content = '{"type": "bar", "x_column": "region", "y_columns": ["revenue", "orders"]}'
+        return type("Response", (), {"content": content})()
+
+
+class TestBlueprintCache:
+    @pytest.fixture
+    def llm(self, monkeypatch):
+        llm = StubLLM()
+        monkeypatch.setattr(generator, "get_json_llm", lambda: llm)
+        settings = generator.settings.model_copy(update={"groq_structured_outputs": False})
+        monkeypatch.setattr(generator, "settings", settings)
+        generator._blueprint_cache.clear()
+        yield llm
+        generator._blueprint_cache.clear()
+
+    def _generate(self, question="revenue and orders by region"):
+        return generate_visualization_blueprint(question, "SELECT region, revenue, orders FROM sales", ROWS, {})
+
+    def test_repeat_request_skips_the_llm(self, llm):
+        first = self._generate()
+        assert self._generate() == first
+        assert first["y_columns"] == ["revenue", "orders"]
+        assert llm.calls == 1
+
+    def test_cached_blueprint_is_a_copy(self, llm):
+        self._generate()["y_columns"].append("region")
+        assert self._generate()["y_columns"] == ["revenue", "orders"]
+
+    def test_different_question_is_a_miss(self, llm):
+        self._generate()
+        self._generate("orders and revenue per region")
+        assert llm.calls == 2
@@ -0,0 +1,50 @@
+"""Unit tests for backend/app/agents/visualization/chart_rules.py"""
+from app.agents.visualization.chart_rules import MAX_PIE_ROWS, choose_chart, question_intents
+from app.agents.visualization.profiling import CATEGORY, NUMERIC, TEMPORAL, profile_columns
+
+
+class TestQuestionIntents:
+    def test_detects_share_and_volume(self):
+        assert question_intents("Revenue share and growth") == {"share", "volume"}
+
+    def test_whole_words_only(self):
+        assert question_intents("shared volumes") == frozenset()
+
+
+class TestChooseChart:
+    def test_single_row_is_kpi(self):
+        chart = choose_chart("total revenue", {"revenue": NUMERIC, "orders": NUMERIC}, 1)
+        assert chart["type"] == "kpi"
+        assert chart["y_columns"] == ["revenue", "orders"]
+
+    def test_time_series_is_line(self):
+        chart = choose_chart("revenue over time", {"month": TEMPORAL, "revenue": NUMERIC}, 12)
+        assert (chart["type"], chart["x_column"]) == ("line", "month")
+
+    def test_volume_time_series_is_area(self):
+        chart = choose_chart("order volume by month", {"month": TEMPORAL, "orders": NUMERIC}, 12)
+        assert chart["type"] == "area"
+
+    def test_share_with_few_rows_is_pie(self):
+        profile = {"region": CATEGORY, "revenue": NUMERIC}
+        assert choose_chart("revenue share by region", profile, MAX_PIE_ROWS)["type"] == "pie"
+        assert choose_chart("revenue share by region", profile, MAX_PIE_ROWS + 1)["type"] == "bar"
+
+    def test_category_measure_is_bar(self):
+        chart = choose_chart("revenue by region", {"region": CATEGORY, "revenue": NUMERIC}, 5)
+        assert (chart["type"], chart["x_column"], chart["y_columns"]) == ("bar", "region", ["revenue"])
+
+    def test_complex_shapes_defer_to_llm(self):
+        profile = {"region": CATEGORY, "month": TEMPORAL, "revenue": NUMERIC}
+        assert choose_chart("revenue by region and month", profile, 20) is None
+        assert choose_chart("compare", {"a": NUMERIC, "b": NUMERIC, "c": CATEGORY}, 5) is None
+
+    def test_identifier_columns_are_not_plotted(self):
+        rows = [{"customer_id": i, "email": f"user{i}@x.io"} for i in range(40)]
+        metadata = {"customer_id": "identifier", "email": "identifier"}
+        profile = profile_columns(["customer_id", "email"], rows, metadata)
+        assert choose_chart("list customers", profile, len(rows)) is None
+
+    def test_single_identifier_row_is_not_kpi(self):
+        profile = profile_columns(["order_id"], [{"order_id": 42}], {"order_id": "identifier"})
+        assert choose_chart("show order 42", profile, 1) is None
@@ -0,0 +1,32 @@
+"""Unit tests for the node progress steps in backend/app/agents/nl_to_sql/graph.py"""
+import anyio
+
+from app.agents.nl_to_sql import graph
+
+
+def _state(**overrides):
+    state = {
+        "llm_messages": [{"role": "system", "content": "schema"}, {"role": "user", "content": "q"}],
+        "sql": "SELECT * FROM missing",
+        "error": "no such table: missing",
+        "retry_count": 0,
+    }
+    state.update(overrides)
+    return state
+
+
+class TestHandleErrorNode:
+    def test_reports_corrected_sql(self, monkeypatch):
+        monkeypatch.setattr(
+            graph, "generate_error_correction", lambda **kwargs: ("Fixed.", {}, "SELECT * FROM orders")
+        )
+        update = anyio.run(graph.handle_error_node, _state())
+        assert update["error"] == ""
+        assert update["retry_count"] == 1
+        assert update["steps"] == ["Corrected SQL (attempt 1)"]
+
+    def test_reports_failure_when_no_sql_comes_back(self, monkeypatch):
+        monkeypatch.setattr(graph, "generate_error_correction", lambda **kwargs: ("Sorry.", {}, ""))
+        update = anyio.run(graph.handle_error_node, _state(retry_count=1))
+        assert update["error"] == "LLM could not generate a corrected query."
+        assert update["steps"] == ["No corrected SQL generated (attempt 2)"]
@@ -0,0 +1,60 @@
+"""Unit tests for POST /api/chat/stream in backend/app/api/v1/routes/chat.py
+
+Session setup runs before the stream starts, so its failures must surface
+as regular HTTP errors rather than a broken event stream.
+"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import app.api.deps as deps
+from app.api.v1.routes import chat as chat_routes
+from app.core.errors import register_exception_handlers
+from app.integrations.supabase_auth import User, get_current_user
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(deps, "increment_usage", lambda *args: True)
+    app = FastAPI()
+    register_exception_handlers(app)
+    app.include_router(chat_routes.router)
+    app.dependency_overrides[get_current_user] = lambda: User(id="user-1")
+    return TestClient(app, raise_server_exceptions=False)
+
+
+def _failing_stream(exc):
+    async def stream_message(*args, **kwargs):
+        raise exc
+        yield  # pragma: no cover - makes this an async generator
+
+    return stream_message
+
+
+def _post(client):
+    return client.post("/api/chat/stream", json={"connection_id": "c1", "message": "hi"})
+
+
+class TestStreamSetupErrors:
+    def test_missing_session_is_404(self, client, monkeypatch):
+        monkeypatch.setattr(chat_routes.chat_service, "stream_message", _failing_stream(ValueError("Session not found.")))
+        assert _post(client).status_code == 404
+
+    def test_bad_input_is_400(self, client, monkeypatch):
+        monkeypatch.setattr(chat_routes.chat_service, "stream_message", _failing_stream(ValueError("Bad input.")))
+        assert _post(client).status_code == 400
+
+    def test_backend_failure_is_503(self, client, monkeypatch):
+        monkeypatch.setattr(chat_routes.chat_service, "stream_message", _failing_stream(RuntimeError("supabase down")))
+        response = _post(client)
+        assert response.status_code == 503
+        assert "supabase down" not in response.text
+
+    def test_stream_starts_after_setup(self, client, monkeypatch):
+        async def stream_message(*args, **kwargs):
+            yield "session", {"session_id": "s1", "user_message_id": "m1"}
+
+        monkeypatch.setattr(chat_routes.chat_service, "stream_message", stream_message)
+        response = _post(client)
+        assert response.status_code == 200
+        assert response.text.startswith("event: session\n")
@@ -0,0 +1,72 @@
+"""Unit tests for backend/app/query_engine/executor.py
+
+Runs execute_query() against an in-memory SQLite database.
+"""
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from app.query_engine import executor
+from app.query_engine.executor import _STREAMABLE_RE, execute_query
+from app.query_engine.safety import sanitize_row_limit
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)"))
+        conn.execute(
+            text("INSERT INTO items (id, name) VALUES (:id, :name)"),
+            [{"id": i, "name": f"item {i}"} for i in range(1, 6)],
+        )
+    yield engine
+    engine.dispose()
+
+
+class TestRowLimit:
+    def test_exact_limit_is_not_truncated(self, engine):
+        result = execute_query("user", engine, "SELECT id FROM items", row_limit=5)
+        assert result.success, result.error
+        assert result.row_count == 5
+        assert not result.truncated
+
+    def test_more_rows_than_limit_is_truncated(self, engine):
+        result = execute_query("user", engine, "SELECT id FROM items", row_limit=4)
+        assert result.row_count == 4
+        assert result.truncated
+        assert [row["id"] for row in result.rows] == [1, 2, 3, 4]
+
+    def test_explicit_larger_limit_is_capped(self, engine):
+        result = execute_query("user", engine, "SELECT id FROM items LIMIT 100", row_limit=2)
+        assert result.row_count == 2
+        assert result.truncated
+
+
+class TestStreamableStatements:
+    @pytest.mark.parametrize(
+        "sql",
+        ["SELECT 1", "  select * from t", "WITH x AS (SELECT 1) SELECT * FROM x", "(SELECT 1) UNION (SELECT 2)"],
+    )
+    def test_queries_stream(self, sql):
+        assert _STREAMABLE_RE.match(sql)
+
+    @pytest.mark.parametrize("sql", ["EXPLAIN SELECT 1", "SHOW TABLES", "DESCRIBE users", "selected"])
+    def test_other_statements_do_not_stream(self, sql):
+        assert not _STREAMABLE_RE.match(sql)
+
+
+class TestQueryHistory:
+    def test_history_records_the_user_facing_limit(self, engine, monkeypatch):
+        logged = []
+
+        def record(result, user_id, connection_id, sql):
+            logged.append(sql)
+            return result
+
+        monkeypatch.setattr(executor, "_log_and_return", record)
+        result = execute_query("user", engine, "SELECT id FROM items", row_limit=2, connection_id="conn")
+        assert result.truncated
+        assert logged == [sanitize_row_limit("SELECT id FROM items", 2)]
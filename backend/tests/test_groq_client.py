@@ -0,0 +1,31 @@
+"""Unit tests for backend/app/integrations/groq_client.py"""
+import anyio
+
+from app.agents.nl_to_sql.llm import get_json_llm
+from app.core.config import settings
+from app.integrations.groq_client import close_groq_clients, get_chat_groq
+
+
+class TestCloseGroqClients:
+    def test_chat_models_are_rebuilt_after_close(self):
+        before = get_chat_groq()
+        fast_before = get_chat_groq(model=settings.groq_model_fast)
+        anyio.run(close_groq_clients)
+        try:
+            assert get_chat_groq() is not before
+            assert get_chat_groq(model=settings.groq_model_fast) is not fast_before
+        finally:
+            anyio.run(close_groq_clients)
+
+    def test_wrappers_use_the_rebuilt_model(self):
+        anyio.run(close_groq_clients)
+        try:
+            assert get_json_llm().bound is get_chat_groq(model=settings.groq_model_fast)
+        finally:
+            anyio.run(close_groq_clients)
+
+    def test_chat_models_are_shared_until_closed(self):
+        try:
+            assert get_chat_groq() is get_chat_groq(0.0)
+        finally:
+            anyio.run(close_groq_clients)
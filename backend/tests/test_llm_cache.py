@@ -0,0 +1,245 @@
+"""Unit tests for backend/app/agents/_llm_cache.py"""
+import asyncio
+
+import pytest
+from app.agents import _llm_cache
+from app.agents._llm_cache import SingleFlight, SQLiteTTLCache, TTLCache, cache_key, question_key
+
+
+class FakeClock:
+    """Stands in for the ``time`` module so expiry can be stepped manually."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(_llm_cache, "time", clock)
+    return clock
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_cache(request, tmp_path):
+    def make(max_entries=3, ttl_seconds=60):
+        if request.param == "memory":
+            return TTLCache(max_entries, ttl_seconds)
+        return SQLiteTTLCache(str(tmp_path / "cache.db"), max_entries, ttl_seconds)
+
+    return make
+
+
+# ---------------------------------------------------------------------------
+# cache_key
+# ---------------------------------------------------------------------------
+
+class TestCacheKey:
+    def test_dict_order_does_not_matter(self):
+        assert cache_key({"a": 1, "b": 2}) == cache_key({"b": 2, "a": 1})
+
+    def test_parts_are_distinct(self):
+        assert cache_key("a", "b") != cache_key("ab")
+        assert cache_key(("a", "b")) == cache_key(["a", "b"])
+
+
+# ---------------------------------------------------------------------------
+# TTLCache and SQLiteTTLCache
+# ---------------------------------------------------------------------------
+
+class TestTTLCaches:
+    def test_get_missing(self, make_cache, clock):
+        assert make_cache().get("nope") is None
+
+    def test_entry_expires_after_ttl(self, make_cache, clock):
+        cache = make_cache(ttl_seconds=60)
+        cache.set("k", "v")
+        clock.now += 59
+        assert cache.get("k") == "v"
+        clock.now += 1
+        assert cache.get("k") is None
+        assert len(cache) == 0
+
+    def test_max_entries_evicts_oldest(self, make_cache, clock):
+        cache = make_cache(max_entries=2)
+        for key in ("a", "b", "c"):
+            cache.set(key, key)
+            clock.now += 1
+        assert len(cache) == 2
+        assert cache.get("a") is None
+        assert (cache.get("b"), cache.get("c")) == ("b", "c")
+
+    def test_overwrite_keeps_one_entry(self, make_cache, clock):
+        cache = make_cache()
+        cache.set("k", 1)
+        cache.set("k", 2)
+        assert len(cache) == 1
+        assert cache.get("k") == 2
+
+    def test_clear(self, make_cache, clock):
+        cache = make_cache()
+        cache.set("k", 1)
+        cache.clear()
+        assert cache.get("k") is None
+
+
+class TestTTLCacheRecency:
+    def test_get_refreshes_lru_position(self, clock):
+        cache = TTLCache(2, 60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+
+
+class TestSQLiteTTLCache:
+    def test_tuple_comes_back_as_list(self, tmp_path, clock):
+        cache = SQLiteTTLCache(str(tmp_path / "cache.db"), 10, 60)
+        cache.set("k", ("Explanation.", {"total": "currency"}, "SELECT 1"))
+        assert cache.get("k") == ["Explanation.", {"total": "currency"}, "SELECT 1"]
+
+    def test_entries_survive_reopen(self, tmp_path, clock):
+        path = str(tmp_path / "cache.db")
+        SQLiteTTLCache(path, 10, 60).set("k", [1, 2])
+        assert SQLiteTTLCache(path, 10, 60).get("k") == [1, 2]
+
+    def test_expired_entries_are_purged_on_open(self, tmp_path, clock):
+        path = str(tmp_path / "cache.db")
+        SQLiteTTLCache(path, 10, 60).set("k", 1)
+        clock.now += 60
+        assert len(SQLiteTTLCache(path, 10, 60)) == 0
+
+
+# ---------------------------------------------------------------------------
+# SingleFlight
+# ---------------------------------------------------------------------------
+
+class TestSingleFlight:
+    def test_concurrent_callers_share_one_call(self):
+        calls = 0
+
+        async def call():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return calls
+
+        async def main():
+            flights = SingleFlight()
+            results = await asyncio.gather(*(flights.run("k", call) for _ in range(5)))
+            return flights, results
+
+        flights, results = asyncio.run(main())
+        assert calls == 1
+        assert results == [1] * 5
+        assert len(flights) == 0
+
+    def test_later_call_runs_again(self):
+        calls = 0
+
+        async def call():
+            nonlocal calls
+            calls += 1
+            return calls
+
+        async def main():
+            flights = SingleFlight()
+            return [await flights.run("k", call), await flights.run("k", call)]
+
+        assert asyncio.run(main()) == [1, 2]
+
+    def test_error_reaches_every_caller(self):
+        async def call():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("boom")
+
+        async def main():
+            flights = SingleFlight()
+            results = await asyncio.gather(
+                flights.run("k", call), flights.run("k", call), return_exceptions=True
+            )
+            return flights, results
+
+        flights, results = asyncio.run(main())
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert len(flights) == 0
+
+    def test_cancelled_caller_does_not_cancel_the_others(self):
+        async def call():
+            await asyncio.sleep(0.02)
+            return "done"
+
+        async def main():
+            flights = SingleFlight()
+            first = asyncio.ensure_future(flights.run("k", call))
+            second = asyncio.ensure_future(flights.run("k", call))
+            await asyncio.sleep(0)
+            first.cancel()
+            return await second, first.cancelled()
+
+        assert asyncio.run(main()) == ("done", True)
+
+
+# ---------------------------------------------------------------------------
+# question_key
+# ---------------------------------------------------------------------------
+
+class TestQuestionKey:
+    def test_ignores_case_and_punctuation(self):
+        assert question_key("Top 10 Customers, by Revenue?") == question_key("top 10 customers by revenue")
+
+    def test_ignores_plurals(self):
+        assert question_key("orders by country") == question_key("order by countries")
+
+    def test_keeps_numbers_distinct(self):
+        assert question_key("top 5 products") != question_key("top 10 products")
+
+    @pytest.mark.parametrize(
+        "first, second",
+        [
+            ("orders per customer", "customers per order"),
+            ("flights from paris to london", "flights from london to paris"),
+            ("revenue by region", "region by revenue"),
+        ],
+    )
+    def test_word_order_is_significant(self, first, second):
+        assert question_key(first) != question_key(second)
+
+    @pytest.mark.parametrize(
+        "first, second",
+        [
+            ("orders per customer", "orders customer"),
+            ("sales by month", "sales month"),
+            ("emails sent to users", "emails sent users"),
+            ("share of revenue", "share revenue"),
+        ],
+    )
+    def test_relational_words_are_kept(self, first, second):
+        assert question_key(first) != question_key(second)
+
+    @pytest.mark.parametrize(
+        "first, second",
+        [
+            ("orders with total > 100", "orders with total < 100"),
+            ("orders with total >= 100", "orders with total <= 100"),
+            ("status != 'paid'", "status = 'paid'"),
+            ("discount above 1.5", "discount above 15"),
+            ("growth over 10%", "growth over 10"),
+        ],
+    )
+    def test_operators_and_numbers_are_kept(self, first, second):
+        assert question_key(first) != question_key(second)
+
+    def test_operator_tokens(self):
+        assert question_key("Orders with total >= 2.5%!") == "order with total >= 2.5%"
+
+    def test_empty_question(self):
+        assert question_key("?!") == ""
@@ -0,0 +1,61 @@
+"""Unit tests for backend/app/agents/visualization/profiling.py"""
+from app.agents.visualization.profiling import (
+    CATEGORY,
+    NUMERIC,
+    TEMPORAL,
+    group_by_kind,
+    profile_columns,
+)
+
+
+class TestProfileColumns:
+    def test_classifies_from_values(self):
+        rows = [
+            {"region": "EU", "revenue": 10.5, "day": "2024-01-02"},
+            {"region": "US", "revenue": 7, "day": "2024-01-03"},
+        ]
+        assert profile_columns(["region", "revenue", "day"], rows) == {
+            "region": CATEGORY,
+            "revenue": NUMERIC,
+            "day": TEMPORAL,
+        }
+
+    def test_skips_leading_nulls(self):
+        rows = [{"total": None}, {"total": 3}]
+        assert profile_columns(["total"], rows) == {"total": NUMERIC}
+
+    def test_all_null_column_is_category(self):
+        assert profile_columns(["x"], [{"x": None}]) == {"x": CATEGORY}
+
+    def test_booleans_are_not_numeric(self):
+        assert profile_columns(["flag"], [{"flag": True}]) == {"flag": CATEGORY}
+
+    def test_mixed_values_are_category(self):
+        rows = [{"code": 1}, {"code": "A"}]
+        assert profile_columns(["code"], rows) == {"code": CATEGORY}
+
+    def test_date_tag_wins(self):
+        rows = [{"year": 2023}, {"year": 2024}]
+        assert profile_columns(["year"], rows, {"year": "date"}) == {"year": TEMPORAL}
+
+    def test_identifier_tag_is_never_numeric(self):
+        rows = [{"customer_id": 1, "email": "a@x.io"}, {"customer_id": 2, "email": "b@x.io"}]
+        metadata = {"customer_id": "identifier", "email": "identifier"}
+        assert profile_columns(["customer_id", "email"], rows, metadata) == {
+            "customer_id": CATEGORY,
+            "email": CATEGORY,
+        }
+
+    def test_categorical_tag_is_never_numeric(self):
+        rows = [{"zip_code": 10115, "orders": 4}]
+        metadata = {"zip_code": "Categorical", "orders": "numeric"}
+        assert profile_columns(["zip_code", "orders"], rows, metadata) == {
+            "zip_code": CATEGORY,
+            "orders": NUMERIC,
+        }
+
+
+class TestGroupByKind:
+    def test_keeps_result_order(self):
+        profile = {"b": NUMERIC, "a": CATEGORY, "c": NUMERIC}
+        assert group_by_kind(profile) == {NUMERIC: ["b", "c"], TEMPORAL: [], CATEGORY: ["a"]}
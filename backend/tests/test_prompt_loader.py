@@ -0,0 +1,40 @@
+"""Unit tests for backend/app/agents/_prompt_loader.py"""
+import pytest
+from app.agents._prompt_loader import PromptTemplate, load_template
+
+
+class TestPromptTemplate:
+    def test_renders_placeholders(self):
+        template = PromptTemplate("Schema:\n__SCHEMA_TEXT__\nType: __DB_TYPE__")
+        assert template.render(schema_text="t(id)", db_type="postgresql") == "Schema:\nt(id)\nType: postgresql"
+
+    def test_repeated_placeholder_is_filled_everywhere(self):
+        template = PromptTemplate("__NAME__ and __NAME__ again")
+        assert template.render(name="x") == "x and x again"
+
+    def test_missing_value_raises(self):
+        with pytest.raises(KeyError):
+            PromptTemplate("Hello __NAME__").render()
+
+    def test_extra_values_are_ignored(self):
+        assert PromptTemplate("Hello __NAME__").render(name="a", other="b") == "Hello a"
+
+    def test_values_are_not_expanded_again(self):
+        template = PromptTemplate("__A__ / __B__")
+        assert template.render(a="__B__", b="b") == "__B__ / b"
+
+    def test_text_without_placeholders(self):
+        assert PromptTemplate("plain text").render() == "plain text"
+
+    def test_lowercase_and_dunder_words_are_left_alone(self):
+        text = "Call __init__ on __main__"
+        assert PromptTemplate(text).render() == text
+
+
+class TestLoadTemplate:
+    def test_strips_file_and_caches(self, tmp_path):
+        path = tmp_path / "prompt.md"
+        path.write_text("\nHi __WHO__\n", encoding="utf-8")
+        template = load_template(str(path))
+        assert template.render(who="there") == "Hi there"
+        assert load_template(str(path)) is template
@@ -0,0 +1,43 @@
+"""Unit tests for backend/app/query_engine/result_serializer.py
+
+Checks that serialize_rows() produces the same JSON-ready rows as the
+recursive serialize_data() path while only converting columns that need it.
+"""
+import datetime
+import decimal
+
+from app.query_engine.result_serializer import serialize_data, serialize_rows
+
+
+class TestSerializeRows:
+    def test_empty_rows(self):
+        assert serialize_rows(["a", "b"], []) == []
+
+    def test_native_columns_pass_through(self):
+        rows = [("north", 10, 1.5, True, None), ("south", 20, 2.5, False, None)]
+        result = serialize_rows(["region", "count", "ratio", "active", "note"], rows)
+        assert result == [
+            {"region": "north", "count": 10, "ratio": 1.5, "active": True, "note": None},
+            {"region": "south", "count": 20, "ratio": 2.5, "active": False, "note": None},
+        ]
+
+    def test_converts_decimal_and_temporal_columns(self):
+        rows = [
+            (decimal.Decimal("12"), decimal.Decimal("3.25"), datetime.date(2024, 1, 31)),
+            (None, decimal.Decimal("1.5"), datetime.date(2024, 2, 29)),
+        ]
+        result = serialize_rows(["total", "avg", "day"], rows)
+        assert result == [
+            {"total": 12, "avg": 3.25, "day": "2024-01-31"},
+            {"total": None, "avg": 1.5, "day": "2024-02-29"},
+        ]
+        assert isinstance(result[0]["total"], int)
+
+    def test_matches_recursive_serializer(self):
+        columns = ["id", "amount", "created_at", "meta"]
+        rows = [
+            (1, decimal.Decimal("9.99"), datetime.datetime(2024, 5, 1, 12, 30), {"tags": ["a"]}),
+            (2, decimal.Decimal("0"), datetime.datetime(2024, 5, 2, 8, 0), None),
+        ]
+        expected = serialize_data([dict(zip(columns, row)) for row in rows])
+        assert serialize_rows(columns, rows) == expected
@@ -5,6 +5,7 @@ normal, edge-case, and adversarial inputs.
 """
 import pytest
 from app.query_engine.safety import (
+    find_unknown_tables,
     validate_query,
     sanitize_row_limit,
     get_readonly_wrapped_query,
@@ -163,3 +164,65 @@ class TestGetReadonlyWrappedQuery:
         # Should not have double semicolons
         assert ";;" not in result
         assert "SELECT * FROM users" in result
+
+
+# ---------------------------------------------------------------------------
+# find_unknown_tables
+# ---------------------------------------------------------------------------
+
+KNOWN_TABLES = ["orders", "customers", "sales.region_targets"]
+
+
+class TestFindUnknownTables:
+    def test_known_tables_pass(self):
+        sql = "SELECT * FROM orders o JOIN customers c ON c.id = o.customer_id"
+        assert find_unknown_tables(sql, KNOWN_TABLES) == []
+
+    def test_reports_unknown_table(self):
+        sql = "SELECT * FROM order_lines l JOIN orders o ON o.id = l.order_id"
+        assert find_unknown_tables(sql, KNOWN_TABLES) == ["order_lines"]
+
+    def test_quoted_and_schema_qualified_names(self):
+        sql = 'SELECT * FROM "Orders" JOIN public.customers USING (id) JOIN sales.region_targets t ON true'
+        assert find_unknown_tables(sql, KNOWN_TABLES) == []
+
+    def test_ignores_cte_names(self):
+        sql = (
+            "WITH recent AS (SELECT * FROM orders), top_customers (id) AS (SELECT 1) "
+            "SELECT * FROM recent JOIN top_customers ON true"
+        )
+        assert find_unknown_tables(sql, KNOWN_TABLES) == []
+
+    def test_ignores_value_from_clauses(self):
+        sql = "SELECT EXTRACT(YEAR FROM created_at), a IS DISTINCT FROM b FROM orders"
+        assert find_unknown_tables(sql, KNOWN_TABLES) == []
+
+    def test_ignores_table_functions_and_catalogs(self):
+        sql = "SELECT * FROM generate_series(1, 3) g JOIN information_schema.tables t ON true"
+        assert find_unknown_tables(sql, KNOWN_TABLES) == []
+
+    def test_ignores_literals_and_comments(self):
+        sql = "SELECT 'from ghosts' FROM orders -- join phantoms\n"
+        assert find_unknown_tables(sql, KNOWN_TABLES) == []
+
+    def test_empty_schema_disables_check(self):
+        assert find_unknown_tables("SELECT * FROM anything", []) == []
+
+    def test_double_quoted_aliases_are_not_table_refs(self):
+        sql = 'SELECT created_at AS "Join Date", SUM(total) AS "Revenue From Returns" FROM orders'
+        assert find_unknown_tables(sql, KNOWN_TABLES) == []
+
+    def test_backtick_aliases_are_not_table_refs(self):
+        sql = "SELECT total AS `Paid From Card` FROM `orders`"
+        assert find_unknown_tables(sql, KNOWN_TABLES) == []
+
+    def test_quoted_unknown_table_is_reported(self):
+        sql = 'SELECT * FROM "Order Lines"'
+        assert find_unknown_tables(sql, KNOWN_TABLES) == ["order lines"]
+
+    def test_quote_inside_string_literal(self):
+        sql = "SELECT 'say \"from x\"' AS note FROM orders"
+        assert find_unknown_tables(sql, KNOWN_TABLES) == []
+
+    def test_dual_is_allowed(self):
+        assert find_unknown_tables("SELECT 1 FROM dual", KNOWN_TABLES) == []
@@ -0,0 +1,54 @@
+"""Unit tests for select_relevant_tables() in backend/app/query_engine/connection_pool.py"""
+from app.db.models.connection import ColumnInfo, ForeignKeyInfo, TableInfo
+from app.query_engine.connection_pool import SCHEMA_FILTER_MIN_TABLES, select_relevant_tables
+
+
+def _table(name, columns=("id",), foreign_keys=()):
+    return TableInfo(
+        name=name,
+        columns=[ColumnInfo(name=col, type="INTEGER", nullable=True, primary_key=col == "id") for col in columns],
+        foreign_keys=[
+            ForeignKeyInfo(column=col, referred_table=ref, referred_column="id") for col, ref in foreign_keys
+        ],
+    )
+
+
+def _schema():
+    tables = [
+        _table("customers", ("id", "email", "created_at")),
+        _table("orders", ("id", "customer_id", "total"), [("customer_id", "customers")]),
+        _table("order_items", ("id", "order_id", "unit_price"), [("order_id", "orders")]),
+        _table("invoices", ("id", "created_at")),
+    ]
+    tables += [_table(f"audit_{i}", ("id",)) for i in range(SCHEMA_FILTER_MIN_TABLES)]
+    return tables
+
+
+def _names(tables):
+    return {table.name for table in tables}
+
+
+class TestSelectRelevantTables:
+    def test_small_schema_is_unchanged(self):
+        schema = _schema()[:4]
+        assert select_relevant_tables(schema, "orders") == schema
+
+    def test_named_table_and_fk_neighbours(self):
+        assert _names(select_relevant_tables(_schema(), "total orders last month")) == {
+            "customers",
+            "orders",
+            "order_items",
+        }
+
+    def test_column_name_selects_its_table(self):
+        assert "customers" in _names(select_relevant_tables(_schema(), "invoices for each email"))
+
+    def test_multi_word_column_needs_every_word(self):
+        picked = _names(select_relevant_tables(_schema(), "invoices by unit"))
+        assert "order_items" not in picked
+        picked = _names(select_relevant_tables(_schema(), "invoices by unit price"))
+        assert "order_items" in picked
+
+    def test_no_mention_returns_full_schema(self):
+        schema = _schema()
+        assert select_relevant_tables(schema, "how is business going?") == schema
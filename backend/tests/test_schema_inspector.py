@@ -0,0 +1,47 @@
+"""Unit tests for backend/app/query_engine/schema_inspector.py and the
+schema cache in backend/app/query_engine/connection_pool.py
+
+Uses an in-memory SQLite database.
+"""
+import anyio
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from app.query_engine import connection_pool
+from app.query_engine.schema_inspector import get_schema, get_view_names
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE orders (id INTEGER PRIMARY KEY, total REAL)"))
+        conn.execute(text("CREATE VIEW big_orders AS SELECT id, total FROM orders WHERE total > 100"))
+    yield engine
+    engine.dispose()
+
+
+class TestGetViewNames:
+    def test_lists_views_not_tables(self, engine):
+        assert get_view_names(engine) == ["big_orders"]
+        assert [table.name for table in get_schema(engine)] == ["orders"]
+
+
+class TestCachedViewNames:
+    def test_views_are_cached_with_the_schema(self, engine):
+        async def load_engine(user_id, connection_id):
+            return engine
+
+        async def inspect_schema():
+            return await connection_pool.get_cached_schema("user", "conn", load_engine)
+
+        try:
+            schema = anyio.run(inspect_schema)
+            assert [table.name for table in schema] == ["orders"]
+            assert connection_pool.get_cached_view_names("user", "conn") == ["big_orders"]
+        finally:
+            connection_pool.release_connection("user", "conn")
+        assert connection_pool.get_cached_view_names("user", "conn") == []
@@ -0,0 +1,162 @@
+"""Behaviour tests for the SQL caches in backend/app/agents/nl_to_sql/generator.py
+
+The LLM is stubbed so each test can count how often it is actually called.
+"""
+import anyio
+import pytest
+
+from app.agents.nl_to_sql import generator, graph
+from app.query_engine.results import QueryExecutionResult
+
+SYSTEM = {"role": "system", "content": "schema: orders(id, total)"}
+RESPONSE = "EXPLANATION: Lists orders.\n```sql\nSELECT id FROM orders\n```"
+
+
+class StubLLM:
+    def __init__(self, content=RESPONSE):
+        self.content = content
+        self.calls = 0
+
+    def invoke(self, messages):
+        self.calls += 1
+        return type("Response", (), {"content": self.content})()
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    llm = StubLLM()
+    monkeypatch.setattr(generator, "get_llm", lambda: llm)
+    generator._sql_cache.clear()
+    generator._question_cache.clear()
+    yield llm
+    generator._sql_cache.clear()
+    generator._question_cache.clear()
+
+
+def _opening(question):
+    return [SYSTEM, {"role": "user", "content": question}]
+
+
+# ---------------------------------------------------------------------------
+# Nothing is cached before the SQL has run
+# ---------------------------------------------------------------------------
+
+class TestCacheAfterSuccess:
+    def test_generated_sql_is_not_cached_on_its_own(self, llm):
+        generator.generate_sql(_opening("list orders"))
+        generator.generate_sql(_opening("list orders"))
+        assert llm.calls == 2
+
+    def test_remembered_sql_is_served(self, llm):
+        messages = _opening("list orders")
+        explanation, metadata, sql = generator.generate_sql(messages)
+        generator.remember_sql(messages, explanation, metadata, sql)
+        assert generator.generate_sql(messages) == (explanation, metadata, sql)
+        assert llm.calls == 1
+
+    def _run_execute_node(self, monkeypatch, result):
+        monkeypatch.setattr(graph, "get_cached_engine", lambda user_id, connection_id: object())
+        monkeypatch.setattr(graph, "execute_query", lambda *args, **kwargs: result)
+        state = {
+            "user_id": "u",
+            "connection_id": "c",
+            "llm_messages": _opening("list orders"),
+            "explanation": "Lists orders.",
+            "column_metadata": {},
+            "sql": "SELECT id FROM orders",
+            "readonly": True,
+        }
+        return anyio.run(graph.execute_sql_node, state)
+
+    def test_failed_execution_is_not_cached(self, llm, monkeypatch):
+        self._run_execute_node(monkeypatch, QueryExecutionResult(success=False, error="boom"))
+        generator.generate_sql(_opening("list orders"))
+        assert llm.calls == 1
+
+    def test_successful_execution_is_cached(self, llm, monkeypatch):
+        self._run_execute_node(
+            monkeypatch, QueryExecutionResult(success=True, columns=["id"], rows=[{"id": 1}], row_count=1)
+        )
+        assert generator.generate_sql(_opening("list orders"))[2] == "SELECT id FROM orders"
+        assert llm.calls == 0
+
+
+# ---------------------------------------------------------------------------
+# _question_cache_key
+# ---------------------------------------------------------------------------
+
+class TestQuestionCacheKey:
+    def test_opening_question_has_a_key(self):
+        assert generator._question_cache_key(_opening("list orders")) is not None
+
+    def test_history_repeating_the_question_is_still_opening(self):
+        messages = _opening("list orders") + [{"role": "user", "content": "list orders"}]
+        assert generator._question_cache_key(messages) == generator._question_cache_key(_opening("list orders"))
+
+    @pytest.mark.parametrize(
+        "turns",
+        [
+            [{"role": "user", "content": "list orders"}, {"role": "assistant", "content": "SELECT 1"}],
+            [{"role": "user", "content": "list orders"}, {"role": "user", "content": "only big ones"}],
+            [],
+        ],
+    )
+    def test_follow_ups_have_no_key(self, turns):
+        assert generator._question_cache_key([SYSTEM, *turns]) is None
+
+    def test_question_without_words_has_no_key(self):
+        assert generator._question_cache_key(_opening("?!")) is None
+
+    def test_key_depends_on_system_prompt(self):
+        other = [{"role": "system", "content": "schema: users(id)"}, {"role": "user", "content": "list orders"}]
+        assert generator._question_cache_key(other) != generator._question_cache_key(_opening("list orders"))
+
+    def test_key_is_versioned(self, monkeypatch):
+        before = generator._question_cache_key(_opening("list orders"))
+        monkeypatch.setattr(generator, "QUESTION_KEY_VERSION", generator.QUESTION_KEY_VERSION + 1)
+        assert generator._question_cache_key(_opening("list orders")) != before
+
+
+# ---------------------------------------------------------------------------
+# Exact and question tiers
+# ---------------------------------------------------------------------------
+
+class TestQuestionTier:
+    def _remember(self, question):
+        messages = _opening(question)
+        generator.remember_sql(messages, "Lists orders.", {}, "SELECT id FROM orders")
+        return messages
+
+    def test_rephrased_question_is_served(self, llm):
+        self._remember("List Orders")
+        assert generator.generate_sql(_opening("list order?"))[2] == "SELECT id FROM orders"
+        assert llm.calls == 0
+
+    def test_question_hit_backfills_exact_tier(self, llm):
+        self._remember("List Orders")
+        messages = _opening("list order?")
+        generator.generate_sql(messages)
+        generator._question_cache.clear()
+        assert generator.generate_sql(messages)[2] == "SELECT id FROM orders"
+        assert llm.calls == 0
+
+    def test_follow_up_is_not_served_from_question_tier(self, llm):
+        self._remember("list orders")
+        follow_up = _opening("list orders") + [
+            {"role": "assistant", "content": "SELECT id FROM orders"},
+            {"role": "user", "content": "list orders"},
+        ]
+        generator.generate_sql(follow_up)
+        assert llm.calls == 1
+
+    @pytest.mark.parametrize("question", ["orders with total < 100", "orders with total = 100"])
+    def test_operators_do_not_collide(self, llm, question):
+        self._remember("orders with total > 100")
+        generator.generate_sql(_opening(question))
+        assert llm.calls == 1
+
+    def test_stale_version_is_a_miss(self, llm, monkeypatch):
+        self._remember("list orders")
+        monkeypatch.setattr(generator, "QUESTION_KEY_VERSION", generator.QUESTION_KEY_VERSION + 1)
+        generator.generate_sql(_opening("List Orders!"))
+        assert llm.calls == 1
@@ -0,0 +1,107 @@
+"""Unit tests for the response parsers in backend/app/agents/nl_to_sql/generator.py
+
+Covers extract_sql(), extract_explanation(), and extract_metadata() on the
+response format the SQL system prompt asks for and on common deviations.
+"""
+import pytest
+from app.agents.nl_to_sql.generator import (
+    extract_explanation,
+    extract_metadata,
+    extract_sql,
+)
+
+FULL_RESPONSE = (
+    "EXPLANATION: Counts orders per customer.\n"
+    "METADATA:\n"
+    "```json\n"
+    '{"customer_name": "identifier", "order_count": "numeric"}\n'
+    "```\n"
+    "```sql\n"
+    "SELECT c.name AS customer_name, COUNT(*) AS order_count\n"
+    "FROM customers c JOIN orders o ON o.customer_id = c.id\n"
+    "GROUP BY c.name\n"
+    "```"
+)
+
+
+# ---------------------------------------------------------------------------
+# extract_sql
+# ---------------------------------------------------------------------------
+
+class TestExtractSql:
+    def test_prefers_sql_fence_over_metadata_json(self):
+        sql = extract_sql(FULL_RESPONSE)
+        assert sql.startswith("SELECT c.name AS customer_name")
+        assert sql.endswith("GROUP BY c.name")
+
+    def test_untagged_fence_after_metadata(self):
+        text = 'METADATA:\n```json\n{"a": "numeric"}\n```\n```\nSELECT a FROM t\n```'
+        assert extract_sql(text) == "SELECT a FROM t"
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "Here: ```SELECT id FROM t```",
+            "```SELECT id FROM t\n```",
+            "```sql SELECT id FROM t```",
+            "```SQL\nSELECT id FROM t\n```",
+            "```sql   \nSELECT id FROM t;```",
+        ],
+    )
+    def test_fence_variants(self, text):
+        assert extract_sql(text).rstrip(";") == "SELECT id FROM t"
+
+    def test_with_query_in_untagged_fence(self):
+        text = "```WITH x AS (SELECT 1) SELECT * FROM x```"
+        assert extract_sql(text) == "WITH x AS (SELECT 1) SELECT * FROM x"
+
+    def test_unfenced_sql_falls_back_to_lines(self):
+        text = "Sure.\nSELECT id\nFROM t;\nThat's it."
+        assert extract_sql(text) == "SELECT id\nFROM t;"
+
+    def test_no_sql(self):
+        assert extract_sql("I cannot answer that.") == ""
+
+    def test_empty_fence_is_skipped(self):
+        assert extract_sql("```sql\n```\n```sql\nSELECT 1\n```") == "SELECT 1"
+
+
+# ---------------------------------------------------------------------------
+# extract_explanation
+# ---------------------------------------------------------------------------
+
+class TestExtractExplanation:
+    def test_stops_before_metadata(self):
+        assert extract_explanation(FULL_RESPONSE) == "Counts orders per customer."
+
+    def test_stops_before_fence_without_metadata(self):
+        text = "EXPLANATION: Lists users.\n```sql\nSELECT id FROM users\n```"
+        assert extract_explanation(text) == "Lists users."
+
+    def test_unlabelled_text_before_fence(self):
+        assert extract_explanation("Lists users.\n```sql\nSELECT 1\n```") == "Lists users."
+
+    def test_default_when_nothing_precedes_sql(self):
+        assert extract_explanation("```sql\nSELECT 1\n```") == "Here's the SQL query for your question."
+
+
+# ---------------------------------------------------------------------------
+# extract_metadata
+# ---------------------------------------------------------------------------
+
+class TestExtractMetadata:
+    def test_fenced_json(self):
+        assert extract_metadata(FULL_RESPONSE) == {
+            "customer_name": "identifier",
+            "order_count": "numeric",
+        }
+
+    def test_inline_json(self):
+        text = 'METADATA: {"total": "currency"}\n```sql\nSELECT 1\n```'
+        assert extract_metadata(text) == {"total": "currency"}
+
+    def test_invalid_json(self):
+        assert extract_metadata("METADATA:\n```json\n{not json}\n```") == {}
+
+    def test_missing_metadata(self):
+        assert extract_metadata("```sql\nSELECT 1\n```") == {}
@@ -0,0 +1,51 @@
+"""Unit tests for backend/app/agents/nl_to_sql/template_recommender.py"""
+import orjson
+import pytest
+
+from app.agents.nl_to_sql import template_recommender
+from app.agents.nl_to_sql.template_recommender import clear_connection, find_template_for_question
+
+TEMPLATES = [
+    {"title": "Top 10 Customers by Revenue", "sql": "SELECT 1", "category": "Sales"},
+    {"title": "Orders per Day", "sql": "SELECT 2", "category": "Operations"},
+]
+
+
+class StubLLM:
+    def invoke(self, messages):
+        return type("Response", (), {"content": orjson.dumps(TEMPLATES).decode()})()
+
+
+@pytest.fixture
+def connection(monkeypatch):
+    monkeypatch.setattr(template_recommender, "get_llm", StubLLM)
+    template_recommender._run_generation("conn", "schema", "postgresql")
+    yield "conn"
+    clear_connection("conn")
+
+
+# ---------------------------------------------------------------------------
+# find_template_for_question
+# ---------------------------------------------------------------------------
+
+class TestFindTemplateForQuestion:
+    @pytest.mark.parametrize(
+        "question",
+        ["Top 10 Customers by Revenue", "top 10 customers by revenue?", "  TOP 10 customer BY revenue!"],
+    )
+    def test_same_question_matches(self, connection, question):
+        assert find_template_for_question(connection, question).sql == "SELECT 1"
+
+    @pytest.mark.parametrize(
+        "question",
+        ["top 5 customers by revenue", "revenue by top 10 customers", "top 10 customers", "?!"],
+    )
+    def test_different_question_does_not_match(self, connection, question):
+        assert find_template_for_question(connection, question) is None
+
+    def test_other_connection_does_not_match(self, connection):
+        assert find_template_for_question("other", "Orders per day") is None
+
+    def test_cleared_connection_does_not_match(self, connection):
+        clear_connection(connection)
+        assert find_template_for_question(connection, "Orders per day") is None